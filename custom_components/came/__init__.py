@@ -6,9 +6,8 @@ https://github.com/Den901/ha_came
 """
 import asyncio
 import logging
-import threading
-from time import sleep
-from typing import List
+from functools import partial
+from typing import Dict, List, Optional
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
@@ -26,15 +25,25 @@ from homeassistant.const import (
     CONF_PASSWORD,
     CONF_TOKEN,
     CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.dispatcher import async_dispatcher_send, dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from .pycame.came_manager import CameManager
 from .pycame.devices import CameDevice
-from .pycame.exceptions import ETIDomoConnectionError, ETIDomoConnectionTimeoutError
-from .pycame.devices.base import TYPE_ENERGY_SENSOR
+from .pycame.exceptions import (
+    ETIDomoConnectionError,
+    ETIDomoDeadlineError,
+    ETIDomoError,
+    ETIDomoRequestDroppedError,
+)
+from .pycame.models import DeviceChanges
+from .pycame.scheduler import PRIORITY_BACKGROUND
+from .pycame.devices.base import TYPE_ENERGY_SENSOR, StateDelta, merge_deltas
 from .pycame.devices.came_scenarios import ScenarioManager
 
 
@@ -43,14 +52,24 @@ from .const import (
     CONF_ENTRY_IS_SETUP,
     CONF_MANAGER,
     CONF_PENDING,
+    DATA_PENDING_SESSIONS,
     DATA_YAML,
+    DISPATCH_FRAME,
     DOMAIN,
+    ENERGY_POLLING_TIMEOUT,
+    LISTENER_RETRY_DELAY,
+    PLANT_RETRY_INTERVAL,
+    RESYNC_INTERVAL,
     SERVICE_FORCE_UPDATE,
     SERVICE_PULL_DEVICES,
+    SESSION_STORAGE_KEY,
     SIGNAL_DELETE_ENTITY,
     SIGNAL_DISCOVERY_NEW,
+    SIGNAL_UPDATE_DEVICE,
     SIGNAL_UPDATE_ENTITY,
     STARTUP_MESSAGE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -114,67 +133,187 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass=hass
     )
 
+    store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id))
+    cached_plant = await store.async_load()
+
+    # La sessione salvata evita un nuovo login a ogni riavvio, se l'ETI/Domo
+    # la rifiuta il manager ne apre una nuova.
+    session_store = Store(
+        hass, STORAGE_VERSION, SESSION_STORAGE_KEY.format(entry.entry_id)
+    )
+    # Il config flow passa la sessione appena aperta, senza un secondo login.
+    saved_session = hass.data.get(DATA_PENDING_SESSIONS, {}).pop(
+        entry.unique_id, None
+    ) or await session_store.async_load()
+
+    def resume_session():
+        """Riprende la sessione salvata, se l'ETI/Domo la accetta ancora."""
+        if not saved_session:
+            return
+        try:
+            resumed = manager.resume_session(saved_session)
+        except ETIDomoError as err:
+            _LOGGER.debug("Session resume failed: %s", err)
+        else:
+            _LOGGER.debug("Previous session resumed: %s", resumed)
+
     def initial_update():
+        resume_session()
         manager.get_all_floors()
         manager.get_all_rooms()
         return manager.get_all_devices()
 
-    try:
-        devices = await hass.async_add_executor_job(initial_update)
-    except ETIDomoConnectionTimeoutError as exc:
-        raise ConfigEntryNotReady from exc
-
-    # Crea evento di stop per thread e polling
-    stop_event = threading.Event()
+    # Le entità vengono create subito dalla cache dell'impianto, senza
+    # richieste all'ETI/Domo: la sessione viene ripresa e la scoperta dal vivo
+    # le riconcilia in background.
+    session_ready = asyncio.Event()
 
-    def _came_update_listener(hass: HomeAssistant, manager: CameManager, stop_event: threading.Event):
-        """Thread che ascolta gli aggiornamenti dei dispositivi in loop."""
-        while not stop_event.is_set():
+    if cached_plant:
+        devices = manager.restore_plant(cached_plant)
+        _LOGGER.debug("Restored %d devices from the plant cache", len(devices))
+    else:
+        try:
+            devices = await hass.async_add_executor_job(initial_update)
+        except (ETIDomoConnectionError, ETIDomoDeadlineError) as exc:
+            # Anche con il circuito aperto: l'ETI/Domo non risponde ancora.
+            raise ConfigEntryNotReady from exc
+        await store.async_save(manager.export_plant())
+        session_ready.set()
+
+    # Gli aggiornamenti arrivati nella stessa finestra sono consegnati alle
+    # entità in un unico giro del loop.
+    pending_updates = {}  # type: Dict[str, Optional[StateDelta]]
+    pending_signals = []
+    flush_handle = None
+
+    @callback
+    def _flush_updates():
+        """Consegna il batch di aggiornamenti alle entità."""
+        nonlocal flush_handle
+        flush_handle = None
+        updated = dict(pending_updates)
+        signals = list(pending_signals)
+        pending_updates.clear()
+        pending_signals.clear()
+
+        if updated:
+            _LOGGER.debug("Received devices status update.")
+        for device_id, delta in updated.items():
+            async_dispatcher_send(hass, SIGNAL_UPDATE_DEVICE.format(device_id), delta)
+        for signal in signals:
+            async_dispatcher_send(hass, *signal)
+
+    @callback
+    def _queue_updates(updated: Dict[str, Optional[StateDelta]]):
+        """Aggiunge gli aggiornamenti al batch della finestra corrente."""
+        nonlocal flush_handle
+        for device_id, delta in updated.items():
+            pending_updates[device_id] = (
+                merge_deltas(pending_updates[device_id], delta)
+                if device_id in pending_updates
+                else delta
+            )
+        pending_signals.extend(manager.scenario_manager.pop_signals())
+        if flush_handle is None and (pending_updates or pending_signals):
+            flush_handle = hass.loop.call_later(DISPATCH_FRAME, _flush_updates)
+
+    @callback
+    def _cancel_flush():
+        """Annulla la consegna in sospeso."""
+        if flush_handle is not None:
+            flush_handle.cancel()
+
+    entry.async_on_unload(_cancel_flush)
+
+    async def async_came_update_listener(hass: HomeAssistant, manager: CameManager):
+        """Task che ascolta gli aggiornamenti dei dispositivi in loop.
+
+        Il long-poll gira nell'executor, il task viene cancellato all'unload
+        senza attendere la risposta in corso.
+        """
+        # Il primo long-poll usa la sessione ripresa, non un nuovo login.
+        await session_ready.wait()
+        while True:
             try:
-                if manager.status_update():
-                    _LOGGER.debug("Received devices status update.")
-                    dispatcher_send(hass, SIGNAL_UPDATE_ENTITY)
+                updated = await hass.async_add_executor_job(manager.status_update)
             except ETIDomoConnectionError:
-                _LOGGER.debug("Server goes offline. Reconnecting...")
-            sleep(1)  # per evitare ciclo troppo veloce
-
-    thread = threading.Thread(
-        target=_came_update_listener, args=(hass, manager, stop_event), daemon=True
-    )
+                # Con il circuito aperto si attende il prossimo tentativo
+                # consentito, che fa da sonda per la ripresa.
+                delay = manager.retry_after or LISTENER_RETRY_DELAY
+                _LOGGER.debug("Server goes offline. Reconnecting in %.1f s", delay)
+                await asyncio.sleep(delay)
+                continue
+            except ETIDomoError as err:
+                _LOGGER.warning("Errore durante la lettura degli stati: %s", err)
+                await asyncio.sleep(LISTENER_RETRY_DELAY)
+                continue
+
+            _queue_updates(updated)
+
+    async def async_resync_loop():
+        """Riallinea periodicamente gli stati persi dal long-poll.
+
+        Le liste dell'impianto sono lette a bassa priorità, solo i dispositivi
+        il cui stato è divergente vengono aggiornati.
+        """
+        while True:
+            await asyncio.sleep(RESYNC_INTERVAL)
+            if not manager.available:
+                continue
+            try:
+                drifted = await hass.async_add_executor_job(manager.resync)
+            except ETIDomoError as err:
+                _LOGGER.debug("Controllo allineamento stati fallito: %s", err)
+                continue
+            if drifted:
+                _LOGGER.info(
+                    "Riallineati %d dispositivi: %s", len(drifted), manager.drift_stats
+                )
+                _queue_updates(drifted)
 
     hass.data[DOMAIN] = {
         CONF_MANAGER: manager,
         CONF_ENTITIES: {},
         CONF_ENTRY_IS_SETUP: set(),
         CONF_PENDING: {},
-        CONF_CAME_LISTENER: thread,
-        "stop_event": stop_event,
+        CONF_CAME_LISTENER: entry.async_create_background_task(
+            hass,
+            async_came_update_listener(hass, manager),
+            f"{DOMAIN}_status_listener",
+        ),
         "energy_polling_task": None,  # sarà settato dopo
     }
 
     hass.data[DOMAIN]["came_scenario_manager"] = manager.scenario_manager
 
-    thread.start()
 
-
-    async def async_energy_polling(hass: HomeAssistant, manager: CameManager, stop_event: threading.Event):
+    async def async_energy_polling(hass: HomeAssistant, manager: CameManager):
         """Polling async per i dati energia."""
        
 
         try:
-            while not stop_event.is_set():
+            while True:
                 try:
-                    response = await asyncio.wait_for(
-                        hass.async_add_executor_job(
+                    # Il timeout è applicato dal manager, che libera subito
+                    # il thread dell'executor.
+                    response = await hass.async_add_executor_job(
+                        partial(
                             manager.application_request,
-                            {"cmd_name": "meters_list_req"},
+                            {
+                                "cmd_name": "meters_list_req",
+                                "topologic_scope": "plant",
+                            },
                             "meters_list_resp",
-                        ),
-                        timeout=5.0  # Timeout di 5 secondi per la chiamata
+                            priority=PRIORITY_BACKGROUND,
+                            timeout=ENERGY_POLLING_TIMEOUT,
+                        )
                     )
-                except asyncio.TimeoutError:
+                except ETIDomoDeadlineError:
                     _LOGGER.warning("Timeout durante richiesta dati energia")
                     response = None
+                except ETIDomoRequestDroppedError:
+                    _LOGGER.debug("Richiesta dati energia scartata, ETI/Domo occupato")
+                    response = None
                 except Exception as exc:
                     _LOGGER.warning("Errore durante richiesta dati energia: %s", exc)
                     response = None
@@ -183,11 +322,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                     meter_updates = response.get("array", [])
                     if isinstance(meter_updates, list) and manager._devices:
                         for d in meter_updates:
-                            for dev in manager._devices:
-                                if dev.type_id == TYPE_ENERGY_SENSOR and d.get("act_id") == dev.act_id:
-                                    if hasattr(dev, "push_update"):
-                                        dev.push_update(d)
-                                        async_dispatcher_send(hass, SIGNAL_UPDATE_ENTITY)
+                            dev = manager.get_device_by_act_id(d.get("act_id"))
+                            if dev is not None and dev.type_id == TYPE_ENERGY_SENSOR:
+                                delta = dev.push_update(d)
+                                if delta:
+                                    async_dispatcher_send(
+                                        hass,
+                                        SIGNAL_UPDATE_DEVICE.format(dev.unique_id),
+                                        delta,
+                                    )
                 await asyncio.sleep(10)
         except asyncio.CancelledError:
             _LOGGER.debug("Polling energia cancellato")
@@ -228,28 +371,118 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await async_load_devices(devices)
 
-    # pylint: disable=unused-argument
-    async def async_update_devices(event_time):
-        """Pull new devices list from server."""
-        _LOGGER.debug("Update devices")
-
-        # Add new discover device
-        devices = await hass.async_add_executor_job(manager.get_all_devices)
-        await async_load_devices(devices)
+    async def async_apply_device_changes(changes: DeviceChanges):
+        """Apply the devices added, removed or changed on the plant."""
+        _LOGGER.debug("Plant changes: %s", changes)
 
         # Delete not exist device
-        newlist_ids = []
-        for device in devices:
-            newlist_ids.append(device.unique_id)
-        for dev_id in list(hass.data[DOMAIN][CONF_ENTITIES]):
-            if dev_id not in newlist_ids:
+        for dev_id in changes.removed:
+            if dev_id in hass.data[DOMAIN][CONF_ENTITIES]:
                 async_dispatcher_send(hass, SIGNAL_DELETE_ENTITY, dev_id)
                 hass.data[DOMAIN][CONF_ENTITIES].pop(dev_id)
 
+        # Add new discover device
+        added = [manager.get_device_by_id(dev_id) for dev_id in changes.added]
+        await async_load_devices([device for device in added if device is not None])
+
+        for dev_id in changes.changed:
+            async_dispatcher_send(hass, SIGNAL_UPDATE_DEVICE.format(dev_id))
+
+        await store.async_save(manager.export_plant())
+
+    def _plant_changed(changes: DeviceChanges):
+        """Hand the plant changes over to the event loop."""
+        hass.add_job(async_apply_device_changes, changes)
+
+    entry.async_on_unload(manager.add_plant_listener(_plant_changed))
+
+    async def async_health_changed(state: str):
+        """Refresh the availability of every entity."""
+        _LOGGER.debug("ETI/Domo connection state: %s", state)
+        for dev_id in list(hass.data[DOMAIN][CONF_ENTITIES]):
+            async_dispatcher_send(hass, SIGNAL_UPDATE_DEVICE.format(dev_id))
+
+    def _health_changed(state: str):
+        """Hand the connection state over to the event loop."""
+        hass.add_job(async_health_changed, state)
+
+    entry.async_on_unload(manager.add_health_listener(_health_changed))
+
+    plant_retry = None
+
+    async def async_reconcile_plant(_now=None):
+        """Reconcile the cached devices with the live plant."""
+        nonlocal plant_retry
+        plant_retry = None
+        try:
+            await hass.async_add_executor_job(manager.rediscover)
+        except ETIDomoError as err:
+            _LOGGER.warning(
+                "Plant discovery failed, retrying in %s seconds: %s",
+                PLANT_RETRY_INTERVAL,
+                err,
+            )
+            plant_retry = async_call_later(
+                hass, PLANT_RETRY_INTERVAL, async_reconcile_plant
+            )
+            return
+
+        await store.async_save(manager.export_plant())
+
+    @callback
+    def _cancel_plant_retry():
+        """Cancel the pending plant discovery retry."""
+        if plant_retry is not None:
+            plant_retry()
+
+    entry.async_on_unload(_cancel_plant_retry)
+
+    async def async_warm_up():
+        """Riprende la sessione, riconcilia la cache e apre le connessioni."""
+        if cached_plant:
+            try:
+                await hass.async_add_executor_job(resume_session)
+            finally:
+                session_ready.set()
+            await async_reconcile_plant()
+        try:
+            await hass.async_add_executor_job(manager.warm_up)
+        except ETIDomoError as err:
+            _LOGGER.debug("Connection warm up failed: %s", err)
+            return
+        _LOGGER.debug("Connection stats: %s", manager.connection_stats)
+        await async_save_session()
+
+    async def async_save_session(_event=None):
+        """Salva la sessione corrente per il prossimo avvio."""
+        session = manager.export_session()
+        if session:
+            await session_store.async_save(session)
+
+    entry.async_create_background_task(hass, async_warm_up(), f"{DOMAIN}_warm_up")
+    entry.async_create_background_task(hass, async_resync_loop(), f"{DOMAIN}_resync")
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_save_session)
+    )
+
+    # pylint: disable=unused-argument
+    async def async_update_devices(event_time):
+        """Pull new devices list from server."""
+        _LOGGER.debug("Update devices")
+        await hass.async_add_executor_job(manager.rediscover)
+
     hass.services.async_register(DOMAIN, SERVICE_PULL_DEVICES, async_update_devices)
 
     async def async_force_update(call):
         """Force all devices to pull data."""
+        # Una sola richiesta per famiglia, i risultati sono consegnati alle
+        # entità con il batch degli aggiornamenti.
+        try:
+            updated = await hass.async_add_executor_job(manager.refresh_devices)
+        except ETIDomoError as err:
+            _LOGGER.warning("Aggiornamento forzato fallito: %s", err)
+        else:
+            _queue_updates(updated)
         async_dispatcher_send(hass, SIGNAL_UPDATE_ENTITY)
 
     hass.services.async_register(DOMAIN, SERVICE_FORCE_UPDATE, async_force_update)
@@ -257,8 +490,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Avvia polling energia async e salva task in hass.data
     async def start_energy_polling(_):
         await asyncio.sleep(5)  # Ritarda l'inizio di 5 secondi
-        hass.data[DOMAIN]["energy_polling_task"] = hass.async_create_task(
-            async_energy_polling(hass, manager, stop_event)
+        hass.data[DOMAIN]["energy_polling_task"] = entry.async_create_background_task(
+            hass, async_energy_polling(hass, manager), f"{DOMAIN}_energy_polling"
         )
 
     hass.bus.async_listen_once("homeassistant_started", start_energy_polling)
@@ -292,11 +525,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         hass.services.async_remove(DOMAIN, SERVICE_FORCE_UPDATE)
         hass.services.async_remove(DOMAIN, SERVICE_PULL_DEVICES)
+        hass.services.async_remove(DOMAIN, "refresh_scenarios")
 
-        thread = hass.data[DOMAIN][CONF_CAME_LISTENER]  # type: threading.Thread
-
-        hass.data.pop(DOMAIN)
+        data = hass.data.pop(DOMAIN)
 
-        thread.join()
+        # Nessun join sul loop: i task vengono solo cancellati. Il manager
+        # chiuso non applica più nulla, un long-poll ancora in corso
+        # nell'executor termina senza toccare i dispositivi.
+        data[CONF_CAME_LISTENER].cancel()
+        if data["energy_polling_task"] is not None:
+            data["energy_polling_task"].cancel()
+        await hass.async_add_executor_job(data[CONF_MANAGER].close)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the plant cache and the saved session of a removed entry."""
+    for key in (STORAGE_KEY, SESSION_STORAGE_KEY):
+        await Store(hass, STORAGE_VERSION, key.format(entry.entry_id)).async_remove()
@@ -96,6 +96,25 @@ def _setup_entities(hass, dev_ids):
 
 
 class CameClimateEntity(CameEntity, ClimateEntity):
+    # Proprietà del dispositivo mostrate dall'entità: temperature, umidità,
+    # modo, stagione, stato e ventilatore. Gli attributi extra vengono
+    # aggiornati insieme a queste.
+    _came_properties = (
+        "current_temperature",
+        "target_temperature",
+        # Setpoint della fascia attiva in modalità AUTO
+        "reason",
+        "t1",
+        "t2",
+        "t3",
+        "target_humidity",
+        "dehumidifier_state",
+        "mode",
+        "season",
+        "state",
+        "fan_mode_ha",
+    )
+
     def __init__(self, device: CameDevice):
         super().__init__(device)
         self.entity_id = ENTITY_ID_FORMAT.format(self.unique_id)
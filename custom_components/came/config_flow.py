@@ -1,5 +1,6 @@
 """Adds config flow for Came."""
 
+import logging
 from typing import Optional
 
 import homeassistant.helpers.config_validation as cv
@@ -9,7 +10,9 @@ from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_TOKEN, CONF_USERN
 from homeassistant.helpers.typing import ConfigType
 from .pycame.came_manager import CameManager
 
-from .const import DOMAIN  # pylint: disable=unused-import
+from .const import CONFIG_FLOW_TIMEOUT, DATA_PENDING_SESSIONS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class CameFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -37,10 +40,17 @@ class CameFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="single_instance_allowed")
 
         if user_input is not None:
-            valid = await self._test_credentials(user_input)
-            if valid:
-                await self.async_set_unique_id(user_input[CONF_HOST])
-                self._abort_if_unique_id_configured()
+            # Check the host before logging in, so an aborted flow leaves no
+            # session open on the ETI/Domo.
+            await self.async_set_unique_id(user_input[CONF_HOST])
+            self._abort_if_unique_id_configured()
+
+            session = await self._test_credentials(user_input)
+            if session is not None:
+                # The entry setup goes on with this session.
+                self.hass.data.setdefault(DATA_PENDING_SESSIONS, {})[
+                    user_input[CONF_HOST]
+                ] = session
                 return self.async_create_entry(
                     title=user_input[CONF_HOST], data=user_input
                 )
@@ -72,17 +82,24 @@ class CameFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
-    async def _test_credentials(self, config: ConfigType):
-        """Return true if credentials is valid."""
+    async def _test_credentials(self, config: ConfigType) -> Optional[dict]:
+        """Return the ETI/Domo session if credentials are valid."""
+        manager = None
         try:
             manager = CameManager(
                 config[CONF_HOST],
                 config[CONF_USERNAME],
                 config[CONF_PASSWORD],
                 config[CONF_TOKEN],
+                connect_timeout=CONFIG_FLOW_TIMEOUT,
+                read_timeout=CONFIG_FLOW_TIMEOUT,
             )
             await self.hass.async_add_executor_job(manager.login)
-            return True
-        except Exception:  # pylint: disable=broad-except
-            pass
-        return False
+            return manager.export_session()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Credentials check failed: %s", err)
+        finally:
+            if manager is not None:
+                # The session stays open on the ETI/Domo for the entry setup.
+                await self.hass.async_add_executor_job(manager.close)
+        return None
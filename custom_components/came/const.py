@@ -15,6 +15,7 @@ VERSION = "1.1 - beta"
 ATTRIBUTION = "Data provided by CAME ETI/Domo"
 ISSUE_URL = "https://github.com/Den901/ha-came/issues"
 DATA_YAML = f"{DOMAIN}__yaml"
+DATA_PENDING_SESSIONS = f"{DOMAIN}__pending_sessions"
 
 STARTUP_MESSAGE = f"""
 -------------------------------------------------------------------
@@ -34,11 +35,17 @@ If you have ANY issues with this you need to open an issue here:
 SIGNAL_DISCOVERY_NEW = DOMAIN + "_discovery_{}"
 SIGNAL_DELETE_ENTITY = DOMAIN + "_delete"
 SIGNAL_UPDATE_ENTITY = DOMAIN + "_update"
+SIGNAL_UPDATE_DEVICE = DOMAIN + "_update_{}"
 
 # Services
 SERVICE_PULL_DEVICES = "pull_devices"
 SERVICE_FORCE_UPDATE = "force_update"
 
+# Storage
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN + ".{}"
+SESSION_STORAGE_KEY = DOMAIN + ".{}.session"
+
 # Configuration and options
 CONF_MANAGER = "manager"
 CONF_CAME_LISTENER = "came_listener"
@@ -46,5 +53,13 @@ CONF_ENTRY_IS_SETUP = "entry_is_setup"
 CONF_PENDING = "pending"
 
 # Defaults
+PLANT_RETRY_INTERVAL = 60
+LISTENER_RETRY_DELAY = 5
+ENERGY_POLLING_TIMEOUT = 5.0
+CONFIG_FLOW_TIMEOUT = 10
+# Intervallo del controllo di allineamento degli stati, in secondi
+RESYNC_INTERVAL = 300
+# Finestra in cui gli aggiornamenti di stato sono raccolti in un solo batch
+DISPATCH_FRAME = 0.05
 
 # Attributes
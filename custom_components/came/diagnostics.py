@@ -0,0 +1,32 @@
+"""Diagnostics support for CAME."""
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from .pycame.came_manager import CameManager
+
+from .const import CONF_MANAGER, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME, "sl_client_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    manager = hass.data[DOMAIN][CONF_MANAGER]  # type: CameManager
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "software_version": manager.software_version,
+        "health": manager.health,
+        "connection_stats": manager.connection_stats,
+        "poll_stats": manager.poll_stats,
+        "deadline_misses": dict(manager.deadline_misses),
+        "drift_stats": manager.drift_stats,
+        "resync_stats": manager.resync_stats,
+        "status_history": manager.history.dump(),
+    }
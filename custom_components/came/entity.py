@@ -5,18 +5,28 @@ For more details about this platform, please refer to the documentation at
 https://github.com/lrzdeveloper/ha-came
 """
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 
 from homeassistant.const import ATTR_ATTRIBUTION, CONF_ENTITIES
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
 from .pycame.devices import CameDevice
+from .pycame.devices.base import StateDelta
 
-from .const import ATTRIBUTION, DOMAIN, SIGNAL_DELETE_ENTITY, SIGNAL_UPDATE_ENTITY
+from .const import (
+    ATTRIBUTION,
+    DOMAIN,
+    SIGNAL_DELETE_ENTITY,
+    SIGNAL_UPDATE_DEVICE,
+    SIGNAL_UPDATE_ENTITY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device state fields whose change always writes the entity state
+ALWAYS_WRITTEN_FIELDS = frozenset({"name"})
+
 
 async def cleanup_device_registry(hass: HomeAssistant, device_id):
     """Remove device registry entry if there are no remaining entities."""
@@ -31,9 +41,19 @@ async def cleanup_device_registry(hass: HomeAssistant, device_id):
 class CameEntity(Entity):
     """CAME base entity."""
 
+    # Device properties read by the entity, None to write on any change
+    _came_properties: Optional[Tuple[str, ...]] = None
+
     def __init__(self, device: CameDevice):
         """Init."""
         self._device = device
+        # Fields of the device state shown by the entity
+        self._came_fields: Optional[FrozenSet[str]] = (
+            None
+            if self._came_properties is None
+            else device.state_fields(*self._came_properties)
+            | ALWAYS_WRITTEN_FIELDS
+        )
 
         self._attr_should_poll = False
         self._attr_unique_id = f"{DOMAIN}_{self._device.unique_id}"
@@ -54,6 +74,13 @@ class CameEntity(Entity):
                 self.hass, SIGNAL_UPDATE_ENTITY, self._update_callback
             )
         )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_UPDATE_DEVICE.format(self._device.unique_id),
+                self._device_update_callback,
+            )
+        )
         self.async_on_remove(
             async_dispatcher_connect(
                 self.hass, SIGNAL_DELETE_ENTITY, self._delete_callback
@@ -72,6 +99,17 @@ class CameEntity(Entity):
         """Call update method."""
         self.async_schedule_update_ha_state(True)
 
+    @callback
+    def _device_update_callback(self, delta: Optional[StateDelta] = None):
+        """Write the state already pushed to the device."""
+        if (
+            delta is not None
+            and self._came_fields is not None
+            and self._came_fields.isdisjoint(delta)
+        ):
+            return
+        self.async_write_ha_state()
+
     @callback
     async def _delete_callback(self, dev_id):
         """Remove this entity."""
@@ -0,0 +1,129 @@
+"""Circuit breaker for the connections with ETI/Domo."""
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from .const import BREAKER_BASE_DELAY, BREAKER_FAILURES, BREAKER_MAX_DELAY
+from .exceptions import ETIDomoCircuitOpenError, ETIDomoConnectionError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Circuit states
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop talking to an ETI/Domo which does not answer.
+
+    After some consecutive connection failures the circuit opens and every
+    request fails fast. Once the backoff delay has elapsed, a single probe
+    request is let through: its success closes the circuit, its failure opens
+    it again for a longer, jittered delay.
+    """
+
+    def __init__(
+        self,
+        failures: int = BREAKER_FAILURES,
+        base_delay: float = BREAKER_BASE_DELAY,
+        max_delay: float = BREAKER_MAX_DELAY,
+        on_change: Optional[Callable[[str], None]] = None,
+    ):
+        """Init instance."""
+        self._max_failures = failures
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._trips = 0
+        self._open_until = None  # type: Optional[float]
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit."""
+        if self._open_until is None:
+            return STATE_CLOSED
+        if self._probing or time.monotonic() >= self._open_until:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Return the time left before a probe is allowed, in seconds."""
+        if self._open_until is None:
+            return 0
+        return max(0.0, self._open_until - time.monotonic())
+
+    def _notify(self, state: str) -> None:
+        """Report a change of state."""
+        _LOGGER.debug("Circuit breaker %s", state)
+        if self._on_change is not None:
+            self._on_change(state)
+
+    def _before_request(self) -> bool:
+        """Let the request through or fail fast, return True for a probe."""
+        with self._lock:
+            if self._open_until is None:
+                return False
+            retry_after = self._open_until - time.monotonic()
+            if self._probing or retry_after > 0:
+                raise ETIDomoCircuitOpenError(retry_after=max(0.0, retry_after))
+            self._probing = True
+            return True
+
+    def _on_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            was_open = self._open_until is not None
+            self._failures = 0
+            self._trips = 0
+            self._open_until = None
+            self._probing = False
+        if was_open:
+            self._notify(STATE_CLOSED)
+
+    def _on_failure(self) -> None:
+        """Count a connection failure, open the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            if not self._probing and (
+                self._open_until is not None or self._failures < self._max_failures
+            ):
+                # Requests sent before the circuit opened don't extend it.
+                return
+            delay = min(self._max_delay, self._base_delay * 2 ** self._trips)
+            delay *= random.uniform(0.5, 1.0)
+            was_open = self._open_until is not None
+            self._trips += 1
+            self._open_until = time.monotonic() + delay
+            self._probing = False
+        _LOGGER.debug("ETI/Domo unreachable, next attempt in %.1f seconds", delay)
+        if not was_open:
+            self._notify(STATE_OPEN)
+
+    def _on_abort(self) -> None:
+        """Give the probe back after an error unrelated to the connection."""
+        with self._lock:
+            self._probing = False
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Watch the outcome of a request."""
+        probe = self._before_request()
+        try:
+            yield
+        except ETIDomoConnectionError:
+            self._on_failure()
+            raise
+        except BaseException:
+            if probe:
+                self._on_abort()
+            raise
+        self._on_success()
@@ -1,27 +1,92 @@
 """Python client for ETI/Domo."""
 
-import json
 import logging
-from typing import List, Optional
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
 
 import requests
 
-from .const import DEBUG_DEEP, STARTUP_MESSAGE, VERSION
-from .devices import get_featured_devices
-from .devices.base import CameDevice, DeviceState
+from . import codec
+from .breaker import STATE_CLOSED, CircuitBreaker
+from .channel import Channel, ChannelPool
+from .deadline import check_deadline, deadline_after, time_left
+from .const import (
+    COMMAND_CHANNELS,
+    CONNECT_TIMEOUT,
+    DEBUG_DEEP,
+    DRIFT_FIELDS,
+    DRIFT_SKIPPED_FEATURES,
+    HISTORY_SIZE,
+    POLL_TIMEOUT,
+    READ_TIMEOUT,
+    STARTUP_MESSAGE,
+    VERSION,
+)
+from .devices import build_featured_devices, get_feature_request
+from .devices.base import CameDevice, DeviceState, StateDelta, merge_deltas
 from .devices.came_scenarios import ScenarioManager
 from .exceptions import (
+    ETIDomoCircuitOpenError,
     ETIDomoConnectionError,
     ETIDomoConnectionTimeoutError,
+    ETIDomoDeadlineError,
     ETIDomoError,
+    ETIDomoRequestDroppedError,
+)
+from .history import StatusHistory
+from .limiter import AdaptiveLimiter
+from .models import DeviceChanges, Floor, Room
+from .poll import PollTimeoutTuner
+from .scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_TIMEOUTS,
+    RequestScheduler,
+    request_priority,
 )
-from .models import Floor, Room
+from .singleflight import SingleFlight, is_read_request, read_key
+from .writes import WriteCoalescer
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 _LOGGER = logging.getLogger(__name__)
 
 _STARTUP = []
 
+# Ack reasons of a session unknown to the ETI/Domo, e.g. after a reboot
+SESSION_ERRORS = (7, 8)
+
+# Ack reasons of an ETI/Domo which cannot keep up with the requests
+OVERLOAD_ERRORS = (3, 10)
+
+
+def state_fingerprint(state: DeviceState, fields: tuple = DRIFT_FIELDS) -> tuple:
+    """Return the given fields of a device state, as checked for drift."""
+    return tuple(repr(state.get(field)) for field in fields)
+
+
+class DeviceIndex(NamedTuple):
+    """Lookup tables of the discovered devices."""
+
+    by_id: Dict[str, CameDevice]
+    by_act_id: Dict[int, CameDevice]
+    by_name: Dict[str, CameDevice]
+
+    @staticmethod
+    def from_devices(devices: List[CameDevice]) -> "DeviceIndex":
+        """Build the lookup tables, the first device wins on duplicated keys."""
+        index = DeviceIndex({}, {}, {})
+        for device in devices:
+            index.by_id.setdefault(device.unique_id, device)
+            if device.act_id is not None:
+                index.by_act_id.setdefault(device.act_id, device)
+            if device.name is not None:
+                index.by_name.setdefault(device.name, device)
+        return index
+
 
 class CameManager:
     """Main class for handling connections with an ETI/Domo device."""
@@ -34,6 +99,9 @@ class CameManager:
         token: str,
         session: Optional[requests.Session] = None,
         hass: Optional["HomeAssistant"] = None,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        poll_timeout: float = POLL_TIMEOUT,
     ):
         """Initialize connection with the ETI/Domo."""
         if not _STARTUP:
@@ -49,9 +117,25 @@ class CameManager:
         self._username = username
         self._password = password
         self._token = token
-        self._session = session or requests.Session()
+        # Long-poll and commands use separate connections, so a command is
+        # never queued behind a status request held open by the server.
+        self._command_channels = ChannelPool(
+            "command", COMMAND_CHANNELS, session, (connect_timeout, read_timeout)
+        )
+        self._limiter = AdaptiveLimiter(self._command_channels.size)
+        self._scheduler = RequestScheduler(
+            self._command_channels.size, limiter=self._limiter
+        )
+        self._status_channel = Channel(
+            "status", timeout=(connect_timeout, poll_timeout)
+        )
+        self._breaker = CircuitBreaker(on_change=self._health_changed)
+        self._health_listeners = []  # type: List[Callable[[str], None]]
         self._hass = hass
         self._client_id = None
+        self._login_lock = threading.Lock()
+        # Set by close, a request still running then leaves the devices alone.
+        self._closed = threading.Event()
         self._swver = None
         self._serial = None
         self._keycode = None
@@ -59,6 +143,18 @@ class CameManager:
         self._floors = None
         self._rooms = None
         self._devices = None
+        self._index = DeviceIndex({}, {}, {})
+        self._discovery_lock = threading.RLock()
+        self._stale = False
+        self._plant = {}
+        self._plant_listeners = []  # type: List[Callable[[DeviceChanges], None]]
+        self._writes = WriteCoalescer()
+        self._reads = SingleFlight()
+        self.deadline_misses = Counter()  # type: Counter[str]
+        self.history = StatusHistory(HISTORY_SIZE)
+        self._poll_tuner = PollTimeoutTuner()
+        self.drift_counts = Counter()  # type: Counter[str]
+        self.resync_counts = Counter()  # type: Counter[str]
         self.scenario_manager = ScenarioManager(self)
         
     @property
@@ -76,8 +172,34 @@ class CameManager:
         """Return a keycode for ETI/Domo."""
         return self._keycode
 
-    def _request(self, command: dict, resp_command: str = None) -> dict:
-        """Handle a request to an ETI/Domo device."""
+    @property
+    def closed(self) -> bool:
+        """Return True once the manager has been closed."""
+        return self._closed.is_set()
+
+    def close(self) -> None:
+        """Close all the connections with the ETI/Domo."""
+        self._closed.set()
+        self._command_channels.close()
+        self._status_channel.close()
+
+    def _request(
+        self,
+        command: dict,
+        resp_command: str = None,
+        channel: Optional[Channel] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """Handle a request to an ETI/Domo device.
+
+        Without a channel, the request is scheduled on the command channels.
+        With a deadline, the request is not sent once it has passed and the
+        reply is not waited beyond it.
+        """
+        if channel is None:
+            return self._scheduled_request(command, resp_command, priority, deadline)
+
         url = f"http://{self._host}/domo/"
         headers = {
             "User-Agent": f"PythonCameManager/{VERSION}",
@@ -85,36 +207,55 @@ class CameManager:
             "Content-Type": "application/x-www-form-urlencoded",
             "Authorization": f"access_token {self._token}",
         }
+        check_deadline(deadline)
+        timeout = channel.timeout
+        remaining = time_left(deadline)
+        # Connect and read timeouts shortened by the deadline
+        cut_short = (False, False)
+        if remaining is not None:
+            cut_short = (remaining < timeout[0], remaining < timeout[1])
+            timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
 
-        try:
-            if DEBUG_DEEP:
-                _LOGGER.debug("Send API request: %s", command)
+        with self._breaker.guard():
+            try:
+                if DEBUG_DEEP:
+                    _LOGGER.debug("Send API request: %s", command)
 
-            response = self._session.post(
-                url, data={"command": json.dumps(command)}, headers=headers
-            )
-            response.raise_for_status()
+                data = {"command": codec.dumps(command)}
+                response = channel.post(
+                    url, data=data, headers=headers, timeout=timeout
+                )
+                response.raise_for_status()
 
-            if DEBUG_DEEP:
-                _LOGGER.debug("Response: %s", response.text)
+                if DEBUG_DEEP:
+                    _LOGGER.debug("Response: %s", response.text)
 
-        except requests.exceptions.ConnectTimeout as exception:
-            raise ETIDomoConnectionTimeoutError(
-                "Timeout occurred while connecting to ETI/Domo device."
-            ) from exception
+            except requests.exceptions.ConnectTimeout as exception:
+                if cut_short[0]:
+                    # Cut short by the deadline, not a sign of a dead server.
+                    raise ETIDomoDeadlineError() from exception
+                raise ETIDomoConnectionTimeoutError(
+                    "Timeout occurred while connecting to ETI/Domo device."
+                ) from exception
 
-        except (
-            requests.exceptions.HTTPError,
-            requests.exceptions.ConnectionError,
-            requests.exceptions.BaseHTTPError,
-        ) as exception:
-            raise ETIDomoConnectionError(
-                "Error occurred while communicating with ETI/Domo device."
-            ) from exception
+            except requests.exceptions.Timeout as exception:
+                if cut_short[1]:
+                    raise ETIDomoDeadlineError() from exception
+                raise ETIDomoConnectionTimeoutError(
+                    "Timeout occurred while waiting for ETI/Domo device."
+                ) from exception
+
+            except (
+                requests.exceptions.HTTPError,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.BaseHTTPError,
+            ) as exception:
+                raise ETIDomoConnectionError(
+                    "Error occurred while communicating with ETI/Domo device."
+                ) from exception
 
         try:
-            response.encoding = "utf-8"
-            resp_json = response.json()
+            resp_json = codec.loads(response.content)
             ack_reason = resp_json.get("sl_data_ack_reason")
 
             if ack_reason == 0:
@@ -152,16 +293,159 @@ class CameManager:
         except ValueError as ex:
             raise ETIDomoError("Error in sl_data_ack_reason, can't find value.") from ex
 
+    def _scheduled_request(
+        self,
+        command: dict,
+        resp_command: Optional[str],
+        priority: int,
+        deadline: Optional[float],
+    ) -> dict:
+        """Send a request through a command channel and feed the limiter."""
+        with self._scheduler.slot(priority, deadline):
+            with self._command_channels.acquire() as channel:
+                start = time.monotonic()
+                try:
+                    response = self._request(
+                        command, resp_command, channel, deadline=deadline
+                    )
+                except ETIDomoError as err:
+                    if (
+                        isinstance(err, ETIDomoConnectionTimeoutError)
+                        or err.errno in OVERLOAD_ERRORS
+                    ):
+                        self._limiter.on_overload()
+                    raise
+
+                self._limiter.on_success(time.monotonic() - start)
+                return response
+
     @property
     def connected(self) -> bool:
         """Return True if entity is available."""
         return self._client_id is not None
 
-    def login(self) -> None:
+    def warm_up(self) -> None:
+        """Open the connections of the command channels in advance.
+
+        The probes are background requests, scheduled like any other: they
+        never hold up a command and are dropped while the ETI/Domo is busy.
+        """
+        self.login()
+        with ThreadPoolExecutor(
+            max_workers=self._command_channels.size,
+            thread_name_prefix="came_warm_up",
+        ) as executor:
+            probes = [
+                executor.submit(
+                    self._application_request,
+                    {"cmd_name": "feature_list_req"},
+                    "feature_list_resp",
+                    priority=PRIORITY_BACKGROUND,
+                )
+                for _ in range(self._command_channels.size)
+            ]
+            for probe in probes:
+                try:
+                    probe.result()
+                except ETIDomoRequestDroppedError:
+                    _LOGGER.debug("Warm up probe dropped, ETI/Domo busy")
+
+    @property
+    def connection_stats(self) -> Dict[str, int]:
+        """Return the connection counters of all the channels.
+
+        A request sent on an open connection is a reuse, every connection
+        opened after the first one of a channel is a reconnect.
+        """
+        channels = list(self._command_channels) + [self._status_channel]
+        stats = {"connections": 0, "requests": 0, "reused": 0, "reconnects": 0}
+        for channel in channels:
+            channel_stats = channel.connection_stats()
+            stats["connections"] += channel_stats["connections"]
+            stats["requests"] += channel_stats["requests"]
+            stats["reused"] += channel_stats["requests"] - channel_stats["connections"]
+            stats["reconnects"] += max(0, channel_stats["connections"] - 1)
+        return stats
+
+    @property
+    def drift_stats(self) -> Dict[str, int]:
+        """Return the drifted devices found by the resync, by family."""
+        return dict(self.drift_counts)
+
+    @property
+    def resync_stats(self) -> Dict[str, int]:
+        """Return the resync runs and the number of devices checked."""
+        return dict(self.resync_counts)
+
+    @property
+    def poll_stats(self) -> Dict[str, Any]:
+        """Return the status long-poll statistics, with the current timeout."""
+        return self._poll_tuner.stats
+
+    @property
+    def health(self) -> str:
+        """Return the state of the circuit breaker."""
+        return self._breaker.state
+
+    @property
+    def available(self) -> bool:
+        """Return True if the ETI/Domo is logged in and answering."""
+        return self.connected and self.health == STATE_CLOSED
+
+    @property
+    def retry_after(self) -> float:
+        """Return the time left before the ETI/Domo is tried again, in seconds."""
+        return self._breaker.retry_after
+
+    def add_health_listener(self, listener: Callable[[str], None]) -> Callable[[], None]:
+        """Register a callback for the circuit breaker state changes.
+
+        Return a function removing the listener.
+        """
+        self._health_listeners.append(listener)
+        return lambda: self._health_listeners.remove(listener)
+
+    def _health_changed(self, state: str) -> None:
+        """Notify the health listeners."""
+        for listener in list(self._health_listeners):
+            listener(state)
+
+    @contextmanager
+    def _login_locked(self, deadline: Optional[float] = None) -> Iterator[None]:
+        """Hold the login lock, waiting for it no longer than the deadline."""
+        timeout = time_left(deadline)
+        if not self._login_lock.acquire(
+            timeout=-1 if timeout is None else max(0.0, timeout)
+        ):
+            raise ETIDomoDeadlineError()
+        try:
+            yield
+        finally:
+            self._login_lock.release()
+
+    def login(self, deadline: Optional[float] = None) -> None:
         """Login function for access to ETI/Domo."""
         if self._client_id:
             return
 
+        with self._login_locked(deadline):
+            if not self._client_id:
+                self._login(deadline)
+
+    def _relogin(self, client_id: str, deadline: Optional[float] = None) -> None:
+        """Replace a session rejected by the ETI/Domo.
+
+        Only the first caller for a given session logs in again, the others
+        wait for it and reuse the new session.
+        """
+        with self._login_locked(deadline):
+            if self._client_id == client_id:
+                _LOGGER.debug("Session rejected by the server, login again.")
+                self._client_id = None
+                self._login(deadline)
+
+    def _login(self, deadline: Optional[float] = None) -> None:
+        """Login to ETI/Domo, the caller must hold the login lock."""
         _LOGGER.debug("Login attempt")
         response = self._request(
             {
@@ -170,6 +454,7 @@ class CameManager:
                 "sl_pwd": self._password,
             },
             "sl_registration_ack",
+            deadline=deadline,
         )
 
         try:
@@ -177,44 +462,159 @@ class CameManager:
                 _LOGGER.debug("Successful authorization.")
                 self._client_id = response.get("sl_client_id")
                 self._features = []
-                self._devices = None
+                # A new session may follow a restart of the ETI/Domo: the
+                # known devices are kept and reconciled on the next update.
+                self._stale = self._devices is not None
             else:
                 raise ETIDomoError("Error in sl_client_id, can't get value.")
         except KeyError as ex:
             raise ETIDomoError("Error in sl_client_id, can't find value.") from ex
 
     def application_request(
-        self, command: dict, resp_command: str = "generic_reply"
+        self,
+        command: dict,
+        resp_command: str = "generic_reply",
+        priority: Optional[int] = None,
+        max_age: float = 0,
+        timeout: Optional[float] = None,
     ) -> dict:
-        """Handle a request to application layer to ETI/Domo."""
-        self.login()
+        """Handle a request to application layer to ETI/Domo.
+
+        Without a priority, list requests are scheduled as state refreshes and
+        everything else as interactive commands. Commands to a device are sent
+        one at a time, the ones queued meanwhile are merged.
+
+        Identical list requests in flight share one response, each caller gets
+        its own copy. A response up to max_age seconds old may be reused.
+
+        The request fails with ETIDomoDeadlineError if it can't be completed
+        within the timeout, by default the one of its priority.
+        """
+        cmd_name = command.get("cmd_name", "")
+        if priority is None:
+            priority = request_priority(cmd_name)
+        if timeout is None:
+            timeout = PRIORITY_TIMEOUTS[priority]
+        deadline = deadline_after(timeout)
+
+        try:
+            if is_read_request(command):
+                return self._reads.fetch(
+                    read_key(command, resp_command),
+                    lambda dl: self._application_request(
+                        command, resp_command, priority=priority, deadline=dl
+                    ),
+                    priority,
+                    max_age,
+                    deadline,
+                )
+            return self._writes.submit(
+                command,
+                lambda cmd, dl: self._application_request(
+                    cmd, resp_command, priority=priority, deadline=dl
+                ),
+                deadline,
+            )
+        except ETIDomoDeadlineError:
+            self.deadline_misses[cmd_name] += 1
+            _LOGGER.debug("Deadline missed by %s", cmd_name)
+            raise
+
+    def _application_request(
+        self,
+        command: dict,
+        resp_command: str,
+        channel: Optional[Channel] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """Handle a request to application layer through the given channel."""
+        self.login(deadline)
 
         if DEBUG_DEEP:
             _LOGGER.debug("Send application layer API request: %s", command)
 
         cmd = command.copy()
+        client_id = self._client_id
 
         try:
-            response = self._request(
+            response = self._data_request(cmd, client_id, channel, priority, deadline)
+        except ETIDomoError as err:
+            if err.errno not in SESSION_ERRORS:
+                raise
+            # Retry once with a new session, if there is still time.
+            check_deadline(deadline)
+            self._relogin(client_id, deadline)
+            response = self._data_request(
+                cmd, self._client_id, channel, priority, deadline
+            )
+
+        if resp_command is not None and response.get("cmd_name") != resp_command:
+            raise ETIDomoError(
+                "Invalid server response. Expected {}. Actual {}".format(
+                    repr(resp_command), repr(response.get("cmd_name"))
+                )
+            )
+
+        return response
+
+    def _data_request(
+        self,
+        cmd: dict,
+        client_id: str,
+        channel: Optional[Channel] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """Send an application layer message within the given session."""
+        try:
+            return self._request(
                 {
                     "sl_cmd": "sl_data_req",
-                    "sl_client_id": self._client_id,
+                    "sl_client_id": client_id,
                     "sl_appl_msg": cmd,
                 },
+                channel=channel,
+                priority=priority,
+                deadline=deadline,
             )
+        except ETIDomoCircuitOpenError:
+            # Nothing has been sent, the session is still valid.
+            raise
         except ETIDomoConnectionError as err:
             _LOGGER.debug("Server goes offline.")
             self._client_id = None
             raise err
 
-        if resp_command is not None and response.get("cmd_name") != resp_command:
-            raise ETIDomoError(
-                "Invalid server response. Expected {}. Actual {}".format(
-                    repr(resp_command), repr(response.get("cmd_name"))
-                )
-            )
+    def refresh_family(self, cmd_base: str, max_age: float = 0) -> dict:
+        """Get the current state of a whole device family.
 
-        return response
+        Concurrent calls for the same family share one plant-scope request.
+        """
+        _LOGGER.debug("Refresh %s family state", cmd_base)
+        return self.application_request(
+            {
+                "cmd_name": f"{cmd_base}_list_req",
+                "topologic_scope": "plant",
+            },
+            f"{cmd_base}_list_resp",
+            max_age=max_age,
+        )
+
+    def refresh_devices(self) -> Dict[str, Optional[StateDelta]]:
+        """Refresh the state of every device, one request per family.
+
+        Return the changed fields by unique ID.
+        """
+        updated = {}  # type: Dict[str, Optional[StateDelta]]
+        for feature in self._get_features():
+            request = get_feature_request(feature)
+            if request is None:
+                continue
+            response = self.application_request(*request)
+            for device_info in response.get("array", []):  # type: DeviceState
+                self._apply_indication(device_info, updated)
+        return updated
 
     def _get_features(self) -> list:
         """Get list of available features."""
@@ -229,6 +629,7 @@ class CameManager:
         self._serial = response.get("serial")
         self._keycode = response.get("keycode")
         self._features = response.get("list")
+        self._plant["features"] = self._features
         return self._features
 
     def get_all_floors(self) -> List[Floor]:
@@ -241,6 +642,7 @@ class CameManager:
             "topologic_scope": "plant",
         }
         response = self.application_request(cmd, "floor_list_resp")
+        self._plant["floors"] = response.get("floor_list", [])
         self._floors = []
         for floor in response.get("floor_list", []):
             self._floors.append(Floor.from_dict(floor))
@@ -256,21 +658,57 @@ class CameManager:
             "topologic_scope": "plant",
         }
         response = self.application_request(cmd, "room_list_resp")
+        self._plant["rooms"] = response.get("room_list", [])
         self._rooms = []
         for room in response.get("room_list", []):
             self._rooms.append(Room.from_dict(room))
         return self._rooms
 
+    def _discover_devices(self) -> List[CameDevice]:
+        """Discover all the devices of the plant.
+
+        The family lists are requested concurrently, at most one per command
+        channel.
+        """
+        features = self._get_features()
+        requests_by_feature = {}
+        for feature in features:
+            request = get_feature_request(feature)
+            if request is not None:
+                requests_by_feature[feature] = request
+
+        families = {}
+        if requests_by_feature:
+            with ThreadPoolExecutor(
+                max_workers=min(len(requests_by_feature), self._command_channels.size),
+                thread_name_prefix="came_discovery",
+            ) as executor:
+                futures = {
+                    feature: executor.submit(self.application_request, *request)
+                    for feature, request in requests_by_feature.items()
+                }
+                for feature, future in futures.items():
+                    families[feature] = future.result()
+
+        devices = []
+        for feature in features:
+            devices.extend(
+                build_featured_devices(self, feature, families.get(feature, {}))
+            )
+
+        # The plant data belongs to this ETI/Domo and software version.
+        self._plant["serial"] = self._serial
+        self._plant["swver"] = self._swver
+        self._plant["families"] = families
+        return devices
+
     def _update_devices(self) -> Optional[List[CameDevice]]:
         """Update devices info."""
         if self._devices is None:
-            _LOGGER.debug("Update devices info")
-
-            devices = []
-            for feature in self._get_features():
-                devices.extend(get_featured_devices(self, feature))
-
-            self._devices = devices
+            with self._discovery_lock:
+                if self._devices is None:
+                    _LOGGER.debug("Update devices info")
+                    self._set_devices(self._discover_devices())
 
         else:
             _LOGGER.debug("Update devices info: Use cached data")
@@ -279,6 +717,180 @@ class CameManager:
         
         return self._devices
 
+    def _set_devices(self, devices: List[CameDevice]) -> None:
+        """Replace the device table together with its lookup tables."""
+        index = DeviceIndex.from_devices(devices)
+        self._devices, self._index = devices, index
+
+    def _merge_devices(self, discovered: List[CameDevice]) -> DeviceChanges:
+        """Merge newly discovered devices into the known ones.
+
+        Known device objects are kept and get the listed fields of the new
+        state, so the entities bound to them stay valid. A device whose implementation has changed is
+        replaced.
+        """
+        known = self._index.by_id
+        changes = DeviceChanges()
+        devices = []
+        for device in discovered:
+            unique_id = device.unique_id
+            current = known.get(unique_id)
+            if current is None or type(current) is not type(device):
+                if current is not None:
+                    changes.removed.add(unique_id)
+                changes.added.add(unique_id)
+                devices.append(device)
+                continue
+
+            if current.reset_state(device.device_state):
+                changes.changed.add(unique_id)
+            devices.append(current)
+
+        changes.removed |= set(known) - {device.unique_id for device in devices}
+        self._set_devices(devices)
+        return changes
+
+    def _replace_devices(self, discovered: List[CameDevice]) -> DeviceChanges:
+        """Replace all the known devices with newly discovered ones."""
+        changes = DeviceChanges(
+            added={device.unique_id for device in discovered},
+            removed=set(self._index.by_id),
+        )
+        self._set_devices(discovered)
+        return changes
+
+    def rediscover(self) -> DeviceChanges:
+        """Discover the plant again and merge it into the known devices."""
+        if self.closed:
+            return DeviceChanges()
+        with self._discovery_lock:
+            return self._rediscover()
+
+    def _rediscover(self) -> DeviceChanges:
+        """Discover the plant again, the caller must hold the discovery lock."""
+        _LOGGER.debug("Rediscover plant")
+        known = (self._plant.get("serial"), self._plant.get("swver"))
+        self._features = []
+        self._floors = None
+        self._rooms = None
+        self.get_all_floors()
+        self.get_all_rooms()
+        discovered = self._discover_devices()
+        if self.closed:
+            return DeviceChanges()
+        if known != (None, None) and known != (self._serial, self._swver):
+            # Another ETI/Domo or a firmware update, the known devices can't
+            # be trusted.
+            _LOGGER.info(
+                "ETI/Domo changed from %s (%s) to %s (%s), rebuild the plant",
+                *known,
+                self._serial,
+                self._swver,
+            )
+            changes = self._replace_devices(discovered)
+        else:
+            changes = self._merge_devices(discovered)
+        self._stale = False
+
+        if changes:
+            for listener in list(self._plant_listeners):
+                listener(changes)
+
+        return changes
+
+    def add_plant_listener(
+        self, listener: Callable[[DeviceChanges], None]
+    ) -> Callable[[], None]:
+        """Register a callback for the devices added, removed or changed.
+
+        The callback runs in the thread which has rediscovered the plant.
+        Return a function which removes the listener.
+        """
+        self._plant_listeners.append(listener)
+
+        def remove_listener():
+            self._plant_listeners.remove(listener)
+
+        return remove_listener
+
+    def export_plant(self) -> dict:
+        """Return the raw discovery data of the plant, suitable for JSON."""
+        return {
+            "serial": self._serial,
+            "swver": self._swver,
+            "keycode": self._keycode,
+            **self._plant,
+        }
+
+    def restore_plant(self, data: dict) -> List[CameDevice]:
+        """Build the devices from the data returned by export_plant.
+
+        No request is sent to the ETI/Domo, the devices are reconciled with the
+        live plant by rediscover.
+        """
+        with self._discovery_lock:
+            self._swver = data.get("swver")
+            self._serial = data.get("serial")
+            self._keycode = data.get("keycode")
+            self._floors = [Floor.from_dict(floor) for floor in data.get("floors", [])]
+            self._rooms = [Room.from_dict(room) for room in data.get("rooms", [])]
+
+            families = data.get("families", {})
+            devices = []
+            for feature in data.get("features", []):
+                devices.extend(
+                    build_featured_devices(self, feature, families.get(feature, {}))
+                )
+
+            self._plant = {
+                key: data[key]
+                for key in ("serial", "swver", "features", "floors", "rooms", "families")
+                if key in data
+            }
+            self._set_devices(devices)
+
+        return devices
+
+    def export_session(self) -> Optional[dict]:
+        """Return the current session, suitable for JSON."""
+        if self._client_id is None:
+            return None
+        return {
+            "host": self._host,
+            "serial": self._serial,
+            "client_id": self._client_id,
+        }
+
+    def resume_session(self, session: dict) -> bool:
+        """Reuse a session returned by export_session.
+
+        The session is probed by a feature list request. If the ETI/Domo
+        rejects it, it is replaced by a new login as usual. Return True if the
+        saved session is still valid.
+        """
+        client_id = session.get("client_id")
+        if not client_id or session.get("host") != self._host:
+            return False
+        if self._serial is not None and session.get("serial") != self._serial:
+            # Another ETI/Domo answers at this address.
+            return False
+
+        with self._login_lock:
+            if self._client_id is not None:
+                return False
+            _LOGGER.debug("Resume the previous session")
+            self._client_id = client_id
+            self._features = []
+
+        self._get_features()
+        return self._client_id == client_id
+
+    def _get_index(self) -> DeviceIndex:
+        """Return the device lookup tables, discovering devices if needed."""
+        if self._devices is None:
+            self._update_devices()
+        return self._index
+
     def get_all_devices(self) -> Optional[List[CameDevice]]:
         """Get list of all discovered devices."""
         return self._update_devices()
@@ -286,27 +898,15 @@ class CameManager:
         
     def get_device_by_id(self, device_id: str) -> Optional[CameDevice]:
         """Get device by unique ID."""
-        for device in self.get_all_devices():
-            if device.unique_id == device_id:
-                return device
-
-        return None
+        return self._get_index().by_id.get(device_id)
 
     def get_device_by_act_id(self, act_id: int) -> Optional[CameDevice]:
         """Get device by device's act ID."""
-        for device in self.get_all_devices():
-            if device.act_id == act_id:
-                return device
-
-        return None
+        return self._get_index().by_act_id.get(act_id)
 
     def get_device_by_name(self, name: str) -> Optional[CameDevice]:
         """Get device by name."""
-        for device in self.get_all_devices():
-            if device.name == name:
-                return device
-
-        return None
+        return self._get_index().by_name.get(name)
 
     def get_devices_by_floor(self, floor_id: int) -> List[CameDevice]:
         """Get a list of devices on a floor."""
@@ -326,39 +926,149 @@ class CameManager:
 
         return devices
 
-    def status_update(self, timeout: Optional[int] = None) -> bool:
-        """Long polling method which read status updates."""
+    def status_update(
+        self, timeout: Optional[int] = None
+    ) -> Dict[str, Optional[StateDelta]]:
+        """Long polling method which read status updates.
+
+        Return the changed fields by unique ID of the devices whose state has
+        changed, None when the whole state may have changed. Without a timeout,
+        the long-poll duration adapts to the plant traffic. Once the manager is
+        closed, nothing is applied and the result is empty.
+        """
+        if self.closed:
+            return {}
+
         if self._devices is None:
             self._update_devices()
-            return True
+            return dict.fromkeys(self._index.by_id)
+
+        if self._stale:
+            # The changes are reported to the plant listeners.
+            with self._discovery_lock:
+                if self._stale:
+                    self._rediscover()
+                    return {}
 
         cmd = {
             "cmd_name": "status_update_req",
         }
-        if timeout is not None:
-            cmd["timeout"] = timeout
-        response = self.application_request(cmd, "status_update_resp")
+        tuned = timeout is None
+        if tuned:
+            timeout = self._poll_tuner.next_timeout(
+                busy=self._scheduler.active + self._scheduler.waiting > 0
+            )
+        cmd["timeout"] = timeout
+
+        start = time.monotonic()
+        try:
+            response = self._application_request(
+                cmd, "status_update_resp", self._status_channel
+            )
+        except ETIDomoError:
+            if self.closed:
+                # The connection has been closed under the long-poll.
+                return {}
+            if tuned:
+                self._poll_tuner.on_error()
+            raise
+        if self.closed:
+            return {}
+        if tuned:
+            self._poll_tuner.on_result(
+                len(response.get("result", [])), time.monotonic() - start
+            )
         if response:
             _LOGGER.debug("Risposta status_update(): %s", response)
 
-        updated = False
+        updated = {}  # type: Dict[str, Optional[StateDelta]]
+        rediscovered = False
+        received = time.monotonic()
 
         for device_info in response.get("result", []):  # type: DeviceState
+            started = time.monotonic()
             _LOGGER.debug("Ricevuto cmd_name: %s - contenuto: %s", device_info.get("cmd_name"), device_info)
 
             # Delega aggiornamenti scenari al manager
             if device_info.get("cmd_name", "").startswith("scenario_"):
-                self.scenario_manager.handle_update(self._hass, device_info)  
+                self.scenario_manager.handle_update(device_info)  
             
             if device_info.get("cmd_name") == "plant_update_ind":
-                self._devices = None
-                self._update_devices()
-                return True
-                         
-            act_id = device_info.get("act_id")
-            if act_id:
-                device = self.get_device_by_act_id(act_id)
-                if device is not None:
-                    updated |= device.update_state(device_info)
+                # Diff-based rebuild, the added, removed and changed devices
+                # are reported to the plant listeners. The rest of the batch
+                # applies on top of the new plant.
+                if not rediscovered:
+                    self.rediscover()
+                    rediscovered = True
+            else:
+                self._apply_indication(device_info, updated)
+
+            self.history.record(device_info, received, time.monotonic() - started)
 
         return updated
+
+    def resync(self) -> Dict[str, Optional[StateDelta]]:
+        """Bring back in line the devices whose state drifted.
+
+        The device families are read at plant scope with background priority,
+        and only the devices whose fingerprint differs from the known state are
+        updated. Devices with a status indication received meanwhile are left
+        alone, the indication is newer. Return the changed fields by unique ID.
+        """
+        self.resync_counts["runs"] += 1
+        drifted = {}  # type: Dict[str, Optional[StateDelta]]
+
+        for feature in self._get_features():
+            request = get_feature_request(feature)
+            if request is None or feature in DRIFT_SKIPPED_FEATURES:
+                continue
+
+            started = time.monotonic()
+            try:
+                response = self.application_request(
+                    *request, priority=PRIORITY_BACKGROUND
+                )
+            except (ETIDomoRequestDroppedError, ETIDomoDeadlineError):
+                _LOGGER.debug("Drift check of %s skipped, ETI/Domo busy", feature)
+                continue
+
+            indicated = set()
+            self.history.replay(
+                lambda info: indicated.add(info.get("act_id")), since=started
+            )
+
+            for device_info in response.get("array", []):  # type: DeviceState
+                act_id = device_info.get("act_id")
+                device = self.get_device_by_act_id(act_id) if act_id else None
+                if device is None or act_id in indicated:
+                    continue
+                self.resync_counts["checked"] += 1
+                # Only the fields reported by the list are compared.
+                fields = tuple(field for field in DRIFT_FIELDS if field in device_info)
+                if state_fingerprint(device.device_state, fields) == state_fingerprint(
+                    device_info, fields
+                ):
+                    continue
+
+                self.drift_counts[feature] += 1
+                _LOGGER.debug('State of "%s" drifted, resync it', device.name)
+                self._apply_indication(device_info, drifted)
+
+        return drifted
+
+    def _apply_indication(
+        self, device_info: DeviceState, updated: Dict[str, Optional[StateDelta]]
+    ) -> None:
+        """Update the device of a status indication, collecting its delta."""
+        act_id = device_info.get("act_id")
+        if not act_id:
+            return
+
+        device = self.get_device_by_act_id(act_id)
+        if device is None:
+            return
+
+        delta = device.update_state(device_info)
+        if delta:
+            uid = device.unique_id
+            updated[uid] = merge_deltas(updated[uid], delta) if uid in updated else delta
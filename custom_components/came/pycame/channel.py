@@ -0,0 +1,117 @@
+"""HTTP channels for ETI/Domo."""
+
+import copy
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .const import CONNECT_TIMEOUT, READ_TIMEOUT
+
+# Connect and read timeouts of a request, in seconds
+Timeout = Tuple[float, float]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Channel:
+    """A dedicated HTTP connection to an ETI/Domo device.
+
+    requests.Session is not thread-safe, so every channel owns its session and
+    serializes the requests sent through it. Its connection pool thus keeps a
+    single keep-alive connection, and failed requests are never retried.
+
+    A session passed by the caller only lends its settings, it is left as is.
+    """
+
+    SESSION_SETTINGS = ("headers", "auth", "proxies", "verify", "cert", "trust_env")
+
+    def __init__(
+        self,
+        name: str,
+        session: Optional[requests.Session] = None,
+        timeout: Timeout = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    ):
+        """Init instance."""
+        self.name = name
+        self.timeout = timeout
+        self._session = requests.Session()
+        if session is not None:
+            for setting in self.SESSION_SETTINGS:
+                setattr(self._session, setting, copy.copy(getattr(session, setting)))
+        self._session.mount(
+            "http://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        )
+        self._lock = threading.Lock()
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request through this channel."""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            return self._session.post(url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return the connections opened and the requests sent."""
+        stats = {"connections": 0, "requests": 0}
+        for adapter in self._session.adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    stats["connections"] += pool.num_connections
+                    stats["requests"] += pool.num_requests
+        return stats
+
+    def close(self) -> None:
+        """Close the connection of this channel."""
+        _LOGGER.debug("Close %s channel", self.name)
+        self._session.close()
+
+
+class ChannelPool:
+    """A fixed set of channels shared by concurrent callers."""
+
+    def __init__(
+        self,
+        name: str,
+        size: int,
+        session: Optional[requests.Session] = None,
+        timeout: Timeout = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    ):
+        """Init instance."""
+        self.name = name
+        self._channels = [
+            Channel(f"{name} #{i}", session, timeout)
+            for i in range(size)
+        ]
+        # LIFO: the most recently used connection is the most likely alive.
+        self._idle = queue.LifoQueue()
+        for channel in reversed(self._channels):
+            self._idle.put(channel)
+
+    @property
+    def size(self) -> int:
+        """Return the number of channels of the pool."""
+        return len(self._channels)
+
+    def __iter__(self) -> Iterator[Channel]:
+        """Iterate over all the channels, idle or not."""
+        return iter(self._channels)
+
+    @contextmanager
+    def acquire(self) -> Iterator[Channel]:
+        """Wait for an idle channel and hold it."""
+        channel = self._idle.get()
+        try:
+            yield channel
+        finally:
+            self._idle.put(channel)
+
+    def close(self) -> None:
+        """Close all the channels of the pool."""
+        for channel in self._channels:
+            channel.close()
@@ -0,0 +1,46 @@
+"""JSON codec for the ETI/Domo messages.
+
+orjson is used when installed, the standard library otherwise.
+"""
+
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+CODEC = "json" if orjson is None else "orjson"
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a message with the standard library."""
+    return json.dumps(obj)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a message with the standard library."""
+    return json.loads(data.decode("utf-8", "replace"))
+
+
+def _orjson_dumps(obj: Any) -> str:
+    """Serialize a message with orjson."""
+    data = orjson.dumps(obj)
+    if not data.isascii():
+        # Keep the \\u escapes of the standard library on the wire.
+        return json.dumps(obj)
+    return data.decode("ascii")
+
+
+def _orjson_loads(data: bytes) -> Any:
+    """Parse a message with orjson."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # e.g. invalid UTF-8, which the standard library replaces.
+        return _json_loads(data)
+
+
+dumps = _json_dumps if orjson is None else _orjson_dumps  # type: Callable[[Any], str]
+loads = _json_loads if orjson is None else _orjson_loads  # type: Callable[[bytes], Any]
@@ -3,6 +3,76 @@
 
 DEBUG_DEEP = False
 
+# Concurrent connections used for commands and discovery requests. They all
+# share a single ETI/Domo session, so they do not count against its limit.
+COMMAND_CHANNELS = 3
+
+# Longest wait for a command channel before a background request is dropped
+BACKGROUND_MAX_WAIT = 2.0
+
+# Requests per second allowed by the adaptive limiter at full speed
+LIMITER_RATE = 10.0
+
+# Reply time above which the adaptive limiter stops widening, in seconds
+LIMITER_LATENCY_TARGET = 1.0
+
+# Consecutive connection failures opening the circuit breaker
+BREAKER_FAILURES = 3
+
+# First and longest wait of the circuit breaker before a probe, in seconds
+BREAKER_BASE_DELAY = 5.0
+BREAKER_MAX_DELAY = 300.0
+
+# Time an identical list request in flight must have left before its
+# deadline for a new caller to join it, in seconds
+READ_JOIN_MIN_TIME = 1.0
+
+# HTTP timeouts, in seconds. The read timeout of the commands stays below
+# the shortest request deadline, so a hung ETI/Domo is reported as such. The
+# status long-poll is held open by the ETI/Domo, its read timeout covers the
+# longest wait of the server.
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 8.0
+POLL_TIMEOUT = 300.0
+
+# Default time allowed to an application request, by priority, in seconds
+INTERACTIVE_TIMEOUT = 10.0
+REFRESH_TIMEOUT = 30.0
+BACKGROUND_TIMEOUT = 10.0
+
+# Bounds of the status long-poll timeout, in seconds. The longest one must
+# stay below POLL_TIMEOUT, the busy one applies while commands are in flight.
+POLL_MIN_TIMEOUT = 5
+POLL_MAX_TIMEOUT = 120
+POLL_BUSY_TIMEOUT = 5
+
+# Device state fields compared by the drift resync
+DRIFT_FIELDS = (
+    "status",
+    "perc",
+    "rgb",
+    "mode",
+    "season",
+    "set_point",
+    "temp",
+    "temp_dec",
+    "fan_speed",
+    "dehumidifier",
+    "antifreeze",
+)
+
+# Families skipped by the drift resync, kept fresh by their own poller
+DRIFT_SKIPPED_FEATURES = ("energy",)
+
+# Status indications kept for replay and diagnostics
+HISTORY_SIZE = 256
+
+# Age of a meters reading still good for an energy sensor update, in seconds
+METERS_MAX_AGE = 10.0
+
+# Age beyond which a list response is no longer reused, in seconds
+READ_MAX_AGE = METERS_MAX_AGE
+
 # Base library constants
 VERSION = "2023.10.1"
 ISSUE_URL = "https://github.com/Den901/python_came_manager/issues"
@@ -0,0 +1,26 @@
+"""Request deadlines for ETI/Domo."""
+
+import time
+from typing import Optional
+
+from .exceptions import ETIDomoDeadlineError
+
+
+def deadline_after(timeout: Optional[float]) -> Optional[float]:
+    """Return the monotonic deadline of a timeout, None for no deadline."""
+    if timeout is None:
+        return None
+    return time.monotonic() + timeout
+
+
+def time_left(deadline: Optional[float]) -> Optional[float]:
+    """Return the time left before a deadline, None for no deadline."""
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(deadline: Optional[float]) -> None:
+    """Raise if the deadline has passed."""
+    if deadline is not None and time.monotonic() >= deadline:
+        raise ETIDomoDeadlineError()
@@ -1,12 +1,12 @@
 """ETI/Domo devices subpackage."""
 
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 
 from .came_analog_sensor import CameAnalogSensor
 from .came_energy_sensor import CameEnergySensor
 
-from .base import CameDevice
+from .base import CameDevice, DeviceState
 from .came_light import CameLight
 from .came_thermo import CameThermo
 from .came_relay import CameRelay
@@ -16,40 +16,40 @@ from .came_scenarios import ScenarioDevice
 
 _LOGGER = logging.getLogger(__name__)
 
-def get_featured_devices(manager, feature: str) -> List[CameDevice]:
-    """Get device implementations for the given feature."""
-    devices = []
+FEATURE_REQUESTS = {
+    "lights": ("light_list_req", "light_list_resp"),
+    "openings": ("openings_list_req", "openings_list_resp"),
+    "relays": ("relays_list_req", "relays_list_resp"),
+    "thermoregulation": ("thermo_list_req", "thermo_list_resp"),
+    "energy": ("meters_list_req", "meters_list_resp"),
+    "digitalin": ("digitalin_list_req", "digitalin_list_resp"),
+}
 
-    if feature == "lights":
-        cmd_name = "light_list_req"
-        response_name = "light_list_resp"
-    elif feature == "openings":
-        cmd_name = "openings_list_req"
-        response_name = "openings_list_resp"
-    elif feature == "relays":
-        cmd_name = "relays_list_req"
-        response_name = "relays_list_resp"
-    elif feature == "thermoregulation":
-        cmd_name = "thermo_list_req"
-        response_name = "thermo_list_resp"
-    elif feature == "energy":
-        cmd_name = "meters_list_req"
-        response_name = "meters_list_resp"
-    elif feature == "digitalin":
-        cmd_name = "digitalin_list_req"
-        response_name = "digitalin_list_resp"
-        
-    elif feature == "scenarios":
-        return [ScenarioDevice(manager)]    # Lo scenario non è un device singolo: restituiamo il gestore centralizzato          
-    else:
-        _LOGGER.warning("Unsupported feature type: %s", feature)
-        return devices
 
+def get_feature_request(feature: str) -> Optional[Tuple[dict, str]]:
+    """Get the list request and the expected response name for the given feature."""
+    if feature not in FEATURE_REQUESTS:
+        return None
+
+    cmd_name, response_name = FEATURE_REQUESTS[feature]
     cmd = {
         "cmd_name": cmd_name,
         "topologic_scope": "plant",
     }
-    response = manager.application_request(cmd, response_name)
+    return cmd, response_name
+
+
+def build_featured_devices(
+    manager, feature: str, response: DeviceState
+) -> List[CameDevice]:
+    """Build device implementations for the given feature from a list response."""
+    devices = []
+
+    if feature == "scenarios":
+        return [ScenarioDevice(manager)]    # Lo scenario non è un device singolo: restituiamo il gestore centralizzato
+    if feature not in FEATURE_REQUESTS:
+        _LOGGER.warning("Unsupported feature type: %s", feature)
+        return devices
 
     for device_info in response.get("array", []):
         if feature == "lights":
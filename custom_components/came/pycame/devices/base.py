@@ -2,7 +2,7 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, Union
 
 from _sha1 import sha1
 
@@ -43,6 +43,38 @@ TYPES = {
 
 StateType = Union[None, str, int, float]
 DeviceState = Dict[str, Any]
+# Changed fields of a device state, as (old value, new value)
+StateDelta = Dict[str, Tuple[Any, Any]]
+
+
+def merge_deltas(
+    older: Optional[StateDelta], newer: Optional[StateDelta]
+) -> Optional[StateDelta]:
+    """Combine two successive deltas of a device, None stands for any change."""
+    if older is None or newer is None:
+        return None
+
+    merged = dict(older)
+    for key, (old, new) in newer.items():
+        merged[key] = (older[key][0] if key in older else old, new)
+    return merged
+
+
+class StateProperty(property):
+    """Device property computed from some fields of the device state."""
+
+    fields = frozenset()  # type: FrozenSet[str]
+
+
+def state_property(*fields: str) -> Callable[[Callable], StateProperty]:
+    """Declare a read-only property computed from the given state fields."""
+
+    def decorator(getter: Callable) -> StateProperty:
+        prop = StateProperty(getter)
+        prop.fields = frozenset(fields)
+        return prop
+
+    return decorator
 
 
 class CameDevice(ABC):
@@ -59,7 +91,8 @@ class CameDevice(ABC):
         """Init instance."""
         self._manager = manager
         self._type_id = type_id
-        self._device_info = device_info
+        # Own copy, the state is updated in place.
+        self._device_info = dict(device_info)
 
         self._device_class = device_class if device_class != "" else self.type.lower()
 
@@ -85,7 +118,7 @@ class CameDevice(ABC):
         """Return the name of device."""
         return self._device_info.get("name")
 
-    @property
+    @state_property("act_id")
     def act_id(self) -> Optional[int]:
         """Return the action ID for device."""
         return self._device_info.get("act_id")
@@ -128,49 +161,86 @@ class CameDevice(ABC):
     @property
     def available(self) -> bool:
         """Return True if device is available."""
-        return self._manager.connected
+        return self._manager.available
 
-    @property
+    @state_property("status")
     def state(self) -> StateType:
         """Return the current device state."""
         return self._device_info.get("status")
 
-    def update_state(self, state: DeviceState) -> bool:
-        """Update device state."""
-        if state.get("act_id") != self.act_id:
+    @classmethod
+    def state_fields(cls, *properties: str) -> FrozenSet[str]:
+        """Return the state fields read by the given properties."""
+        fields = set()
+        for name in properties:
+            prop = getattr(cls, name, None)
+            if not isinstance(prop, StateProperty):
+                raise TypeError(f"{cls.__name__}.{name} is not a state property")
+            fields |= prop.fields
+        return frozenset(fields)
+
+    @property
+    def device_state(self) -> DeviceState:
+        """Return the raw device state reported by the ETI/Domo."""
+        return self._device_info
+
+    def reset_state(self, state: DeviceState) -> bool:
+        """Merge a newly discovered state, return True if any field has changed.
+
+        Only the fields of the discovered state are compared and replaced, the
+        ones received from status indications alone are kept.
+        """
+        info = self._device_info
+        changed = {
+            key: val
+            for key, val in state.items()
+            if key not in info or info[key] != val
+        }
+        if not changed:
             return False
 
-        if state.get("cmd_name"):
-            state.pop("cmd_name")
+        _LOGGER.debug(
+            'Rediscovered new state for %s "%s": %s',
+            self.type.lower(),
+            self.name,
+            changed,
+        )
+        info.update(changed)
+
+        return True
+
+    def update_state(self, state: DeviceState) -> StateDelta:
+        """Merge a state update, return the fields which have changed."""
+        if state.get("act_id") != self.act_id:
+            return {}
 
-        log = {}
-        for k, val in state.items():
-            if self._device_info.get(k) != val:
-                log[k] = val
-        if log:
+        info = self._device_info
+        delta = {
+            key: (info.get(key), val)
+            for key, val in state.items()
+            if key != "cmd_name" and (key not in info or info[key] != val)
+        }
+        if not delta:
+            return delta
+
+        for key, (_, val) in delta.items():
+            info[key] = val
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug(
                 'Received new state for %s "%s": %s',
                 self.type.lower(),
                 self.name,
-                log,
+                {key: val for key, (_, val) in delta.items()},
             )
 
-        self._device_info = state
+        return delta
 
-        return bool(log)
-
-    def _force_update(self, cmd_base: str, field: str = "array"):
+    def _force_update(self, cmd_base: str, field: str = "array", max_age: float = 0):
         """Force update device state."""
         self._check_act_id()
 
-        cmd = {
-            "cmd_name": f"{cmd_base}_list_req",
-            "topologic_scope": "act",
-            "value": self.act_id,
-        }
-        res = self._manager.application_request(cmd, f"{cmd_base}_list_resp").get(
-            field, []
-        )
+        res = self._manager.refresh_family(cmd_base, max_age).get(field, [])
         if not isinstance(res, list):
             res = [res]
         for device_info in res:  # type: DeviceState
@@ -2,8 +2,15 @@
 
 import logging
 from typing import Optional
+from ..const import METERS_MAX_AGE
 from ..exceptions import ETIDomoUnmanagedDeviceError
-from .base import TYPE_ENERGY_SENSOR, CameDevice, DeviceState, StateType
+from .base import (
+    TYPE_ENERGY_SENSOR,
+    CameDevice,
+    DeviceState,
+    StateDelta,
+    StateType,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,18 +37,19 @@ class CameEnergySensor(CameDevice):
     def update(self):
         """Update device state."""
         try:
-            self._force_update(self._update_cmd_base, self._update_src_field)
+            # The energy poller keeps the meters reading fresh.
+            self._force_update(
+                self._update_cmd_base, self._update_src_field, METERS_MAX_AGE
+            )
         except ETIDomoUnmanagedDeviceError:
             pass
 
-    def push_update(self, state: DeviceState):
+    def push_update(self, state: DeviceState) -> StateDelta:
         """Update from ETI/Domo push data."""
         if self._device_info.get("id") != state.get("id"):           
-            return
+            return {}
             
-        updated = self.update_state(state)
-        if updated and hasattr(self, "hass_entity"):
-            self.hass_entity.async_write_ha_state()
+        return self.update_state(state)
     
     @property
     def state(self) -> StateType:
@@ -1,9 +1,9 @@
 from .base import CameDevice
 import logging
+from collections import deque
+from typing import Deque, List, Tuple
 from ..exceptions import ETIDomoError
 
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +41,8 @@ class ScenarioDevice(CameDevice):
 class ScenarioManager:
     def __init__(self, manager):
         self._manager = manager
+        # Segnali per Home Assistant, consegnati insieme agli stati dei device
+        self._signals = deque()  # type: Deque[Tuple]
 
 
     def get_scenarios(self):
@@ -86,27 +88,24 @@ class ScenarioManager:
         self._scenarios = self.get_scenarios()
         _LOGGER.debug("refresh_scenarios: lista scenari aggiornata, totale scenari: %d", len(self._scenarios))
         
-    def handle_update(self, hass, device_info: dict):
+    def handle_update(self, device_info: dict):
         """Gestisce aggiornamenti relativi agli scenari."""
         cmd_name = device_info.get("cmd_name")
 
         if cmd_name == "scenario_status_ind":
             scenario_id = device_info.get("id")
             _LOGGER.debug("ScenarioManager: aggiornamento stato scenario %s: %s", scenario_id, device_info)
-            hass.add_job(
-                async_dispatcher_send,
-                hass,
-                "came_scenario_update",
-                scenario_id,
-                device_info,
-            )
+            self._signals.append(("came_scenario_update", scenario_id, device_info))
 
         elif cmd_name == "scenario_user_ind" and device_info.get("action") in ("add", "create"):
             _LOGGER.debug("ScenarioManager: nuovo scenario utente aggiunto: aggiorno lista e invio segnale")
             self.refresh_scenarios()
-            hass.add_job(
-                async_dispatcher_send,
-                hass,
-                "came_scenarios_refreshed"
-            )
+            self._signals.append(("came_scenarios_refreshed",))
+
+    def pop_signals(self) -> List[Tuple]:
+        """Restituisce e svuota i segnali accodati dalle indicazioni."""
+        signals = []
+        while self._signals:
+            signals.append(self._signals.popleft())
+        return signals
 
@@ -3,7 +3,7 @@
 import logging
 from typing import Optional
 
-from .base import TYPE_THERMOSTAT, CameDevice, DeviceState
+from .base import TYPE_THERMOSTAT, CameDevice, DeviceState, state_property
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,23 +43,23 @@ class CameThermo(CameDevice):
         super().__init__(manager, TYPE_THERMOSTAT, device_info)
         #self.raw_zone = device_info
 
-    @property
+    @state_property("mode")
     def mode(self) -> Optional[int]:
         """Get current mode."""
         return self._device_info.get("mode")
 
-    @property
+    @state_property("season")
     def season(self) -> Optional[str]:
         """Get current season mode."""
         return self._device_info.get("season")
 
-    @property
+    @state_property("temp", "temp_dec")
     def current_temperature(self) -> Optional[float]:
         """Return the current temperature."""
         temp = self._device_info.get("temp", self._device_info.get("temp_dec"))
         return temp / 10 if temp is not None else None
 
-    @property
+    @state_property("set_point")
     def target_temperature(self) -> Optional[float]:
         """Return the temperature we try to reach."""
         temp = self._device_info.get("set_point")
@@ -70,29 +70,29 @@ class CameThermo(CameDevice):
         """Return True if device can change target temperature."""
         return True
 
-    @property
+    @state_property("dehumidifier")
     def dehumidifier_state(self) -> Optional[int]:
         """Return the state of dehumidifier."""
         dehumidifier = self._device_info.get("dehumidifier", {})
         return dehumidifier.get("enabled")
 
-    @property
+    @state_property("dehumidifier")
     def target_humidity(self) -> Optional[int]:
         """Return the humidity we try to reach."""
         dehumidifier = self._device_info.get("dehumidifier", {})
         return dehumidifier.get("setpoint")
 
-    @property
+    @state_property("dehumidifier")
     def support_target_humidity(self) -> bool:
         """Return True if device can change target humidity."""
         return self.target_humidity is not None
 
-    @property
+    @state_property("fan_speed")
     def fan_speed(self) -> Optional[int]:
         """Get current fan speed."""
         return self._device_info.get("fan_speed")
 
-    @property
+    @state_property("fan_speed")
     def support_fan_speed(self) -> bool:
         """Return True if device can change wind speed."""
         return self.fan_speed is not None
@@ -149,7 +149,7 @@ class CameThermo(CameDevice):
 
         _LOGGER.debug('Set new status for thermostat "%s": %s', self.name, log)
 
-    @property
+    @state_property("fan_speed")
     def fan_mode(self) -> Optional[str]:
         """Return current fan mode as string (low/medium/high)."""
         speed = self.fan_speed
@@ -193,59 +193,55 @@ class CameThermo(CameDevice):
                 e,
             )
           
-    @property
+    @state_property("t1")
     def t1(self) -> Optional[int]:
         return self._device_info.get("t1")
 
-    @property
+    @state_property("t2")
     def t2(self) -> Optional[int]:
         return self._device_info.get("t2")
 
-    @property
+    @state_property("t3")
     def t3(self) -> Optional[int]:
         return self._device_info.get("t3")
 
-    @property
+    @state_property("reason")
     def reason(self) -> Optional[int]:
         return self._device_info.get("reason")
         
-    @property
+    @state_property("floor_ind")
     def floor_ind(self) -> Optional[int]:
         return self._device_info.get("floor_ind")
 
-    @property
+    @state_property("room_ind")
     def room_ind(self) -> Optional[int]:
         return self._device_info.get("room_ind")
 
-    @property
+    @state_property("temp_dec")
     def temp_dec(self) -> Optional[int]:
         return self._device_info.get("temp_dec")
 
-    @property
+    @state_property("set_point")
     def set_point(self) -> Optional[int]:
         return self._device_info.get("set_point")
 
-    @property
+    @state_property("antifreeze")
     def antifreeze(self) -> Optional[int]:
         return self._device_info.get("antifreeze")
 
-    @property
+    @state_property("f3a")
     def f3a(self) -> Optional[dict]:
         return self._device_info.get("f3a")
 
-    @property
+    @state_property("thermo_algo")
     def thermo_algo(self) -> Optional[dict]:
         return self._device_info.get("thermo_algo")
         
-    @property
+    @state_property("status")
     def status(self) -> Optional[int]:
         return self._device_info.get("status")
 
-    @property
-    def antifreeze(self) -> Optional[int]:
-        return self._device_info.get("antifreeze")        
-        
-    @property
+    @state_property("fan_speed")
     def fan_mode_ha(self) -> str:
         """Velocità nel linguaggio di HA (minuscolo)."""
         return self.fan_mode.lower()
@@ -20,6 +20,42 @@ class ETIDomoConnectionTimeoutError(ETIDomoConnectionError, TimeoutError):
     """ETI/Domo connection Timeout exception."""
 
 
+class ETIDomoCircuitOpenError(ETIDomoConnectionError):
+    """ETI/Domo exception for a request refused while the device is down."""
+
+    def __init__(
+        self,
+        status: str = "ETI/Domo is unreachable",
+        errno: Optional[int] = None,
+        retry_after: float = 0,
+    ):
+        """Initialize."""
+        super().__init__(status, errno)
+        self.retry_after = retry_after
+
+
+class ETIDomoRequestDroppedError(ETIDomoError):
+    """ETI/Domo exception for a background request dropped under load."""
+
+    def __init__(
+        self, status: str = "Request dropped, the ETI/Domo is busy", errno: Optional[int] = None
+    ):
+        """Initialize."""
+        super().__init__(status, errno)
+
+
+class ETIDomoDeadlineError(ETIDomoError, TimeoutError):
+    """ETI/Domo exception for a request which missed its deadline."""
+
+    def __init__(
+        self,
+        status: str = "Request deadline exceeded",
+        errno: Optional[int] = None,
+    ):
+        """Initialize."""
+        super().__init__(status, errno)
+
+
 class ETIDomoUnmanagedDeviceError(ETIDomoError):
     """ETI/Domo exception for unmanaged device."""
 
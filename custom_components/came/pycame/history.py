@@ -0,0 +1,84 @@
+"""Recent status indications received from ETI/Domo."""
+
+import threading
+from array import array
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .devices.base import DeviceState
+
+# Indication, monotonic time of reception, processing latency in seconds
+HistoryEntry = Tuple[DeviceState, float, float]
+
+
+class StatusHistory:
+    """Fixed-size ring buffer of the status indications.
+
+    The slots are allocated once: recording an indication only stores a
+    reference to it, along with its reception time and processing latency.
+    The oldest indications are overwritten first.
+    """
+
+    def __init__(self, size: int):
+        """Init instance."""
+        self._size = size
+        self._lock = threading.Lock()
+        self._indications = [None] * size  # type: List[Optional[DeviceState]]
+        self._received = array("d", bytes(8 * size))
+        self._latency = array("d", bytes(8 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of recorded indications."""
+        return self._count
+
+    def record(self, indication: DeviceState, received: float, latency: float) -> None:
+        """Store an indication, which must not be modified afterwards."""
+        with self._lock:
+            slot = self._next
+            self._indications[slot] = indication
+            self._received[slot] = received
+            self._latency[slot] = latency
+            self._next = (slot + 1) % self._size
+            self._count = min(self._count + 1, self._size)
+
+    def _entries(self) -> List[HistoryEntry]:
+        """Return a snapshot of the entries, oldest first."""
+        with self._lock:
+            start = (self._next - self._count) % self._size
+            slots = [(start + i) % self._size for i in range(self._count)]
+            return [
+                (self._indications[slot], self._received[slot], self._latency[slot])
+                for slot in slots
+            ]
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        """Iterate over a snapshot of the entries, oldest first."""
+        return iter(self._entries())
+
+    def replay(
+        self,
+        callback: Callable[[DeviceState], None],
+        predicate: Optional[Callable[[DeviceState], bool]] = None,
+        since: Optional[float] = None,
+    ) -> int:
+        """Feed the recorded indications to a late subscriber, oldest first.
+
+        Return the number of indications replayed.
+        """
+        replayed = 0
+        for indication, received, _ in self._entries():
+            if since is not None and received < since:
+                continue
+            if predicate is not None and not predicate(indication):
+                continue
+            callback(indication)
+            replayed += 1
+        return replayed
+
+    def dump(self) -> List[dict]:
+        """Return the entries in a form suitable for diagnostics."""
+        return [
+            {"received": received, "latency": latency, "indication": indication}
+            for indication, received, latency in self._entries()
+        ]
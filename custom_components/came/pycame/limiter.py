@@ -0,0 +1,85 @@
+"""Adaptive rate and concurrency limiter for ETI/Domo."""
+
+import logging
+import threading
+import time
+
+from .const import LIMITER_LATENCY_TARGET, LIMITER_RATE
+
+_LOGGER = logging.getLogger(__name__)
+
+# AIMD tuning
+DECREASE_FACTOR = 0.5
+
+
+class AdaptiveLimiter:
+    """Limit the load put on the ETI/Domo embedded server.
+
+    A single AIMD window drives both the allowed concurrency and the refill
+    rate of a token bucket. The window widens additively while the replies
+    are fast and halves when the server reports an overload or times out.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate: float = LIMITER_RATE,
+        latency_target: float = LIMITER_LATENCY_TARGET,
+    ):
+        """Init instance."""
+        self._max_window = float(max_concurrency)
+        self._max_rate = rate
+        self._latency_target = latency_target
+        self._lock = threading.Lock()
+        self._window = self._max_window
+        self._tokens = self._max_window
+        self._refilled = time.monotonic()
+
+    @property
+    def concurrency(self) -> int:
+        """Return the number of requests currently allowed in flight."""
+        return max(1, int(self._window))
+
+    @property
+    def rate(self) -> float:
+        """Return the number of requests currently allowed per second."""
+        return self._max_rate * self._window / self._max_window
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self._tokens = min(
+            self._window, self._tokens + (now - self._refilled) * self.rate
+        )
+        self._refilled = now
+
+    def reserve(self) -> float:
+        """Take a token if available.
+
+        Return 0 when a token has been taken, otherwise the time to wait
+        before the next one.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def on_success(self, latency: float) -> None:
+        """Widen the window after a healthy reply."""
+        if latency > self._latency_target:
+            return
+
+        with self._lock:
+            self._window = min(self._max_window, self._window + 1 / self._window)
+
+    def on_overload(self) -> None:
+        """Back off after an overload reply or a timeout."""
+        with self._lock:
+            self._window = max(1.0, self._window * DECREASE_FACTOR)
+            self._tokens = min(self._tokens, self._window)
+        _LOGGER.debug(
+            "ETI/Domo overloaded, limit requests to %d in flight and %.1f/s",
+            self.concurrency,
+            self.rate,
+        )
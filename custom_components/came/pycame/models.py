@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Set
 
 
 @dataclass
@@ -40,3 +40,16 @@ class Room:
             name=str(data["name"]),
             floor_id=int(data["floor_ind"]),
         )
+
+
+@dataclass
+class DeviceChanges:
+    """Object holding the device differences between two plant discoveries."""
+
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    changed: Set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        """Return True if anything has changed."""
+        return bool(self.added or self.removed or self.changed)
@@ -0,0 +1,36 @@
+"""Results shared between concurrent ETI/Domo callers."""
+
+import threading
+from typing import Any, Optional
+
+from .deadline import time_left
+from .exceptions import ETIDomoDeadlineError
+
+
+class PendingResult:
+    """The result of a request shared by all the callers that joined it."""
+
+    def __init__(self):
+        """Init instance."""
+        self._done = threading.Event()
+        self._result = None  # type: Any
+        self._error = None  # type: Optional[BaseException]
+
+    def set_result(self, result: Any) -> None:
+        """Publish the result to the waiting callers."""
+        self._result = result
+        self._done.set()
+
+    def set_error(self, error: BaseException) -> None:
+        """Publish the error to the waiting callers."""
+        self._error = error
+        self._done.set()
+
+    def wait(self, deadline: Optional[float] = None) -> Any:
+        """Wait for the request and return its result."""
+        timeout = time_left(deadline)
+        if not self._done.wait(None if timeout is None else max(0.0, timeout)):
+            raise ETIDomoDeadlineError()
+        if self._error is not None:
+            raise self._error
+        return self._result
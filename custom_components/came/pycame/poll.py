@@ -0,0 +1,74 @@
+"""Adaptive long-poll timeout for the ETI/Domo status updates."""
+
+import logging
+import threading
+from typing import Any, Dict
+
+from .const import POLL_BUSY_TIMEOUT, POLL_MAX_TIMEOUT, POLL_MIN_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollTimeoutTuner:
+    """Choose the timeout of the next status long-poll from the traffic.
+
+    The timeout doubles after every quiet poll, so an idle plant costs few
+    requests. It falls back to the minimum after indications or errors, and
+    is capped while commands are in flight, so updates are not held back.
+    """
+
+    def __init__(
+        self,
+        minimum: int = POLL_MIN_TIMEOUT,
+        maximum: int = POLL_MAX_TIMEOUT,
+        busy: int = POLL_BUSY_TIMEOUT,
+    ):
+        """Init instance."""
+        self._minimum = minimum
+        self._maximum = maximum
+        self._busy = busy
+        self._lock = threading.Lock()
+        self._timeout = minimum
+        self._polls = 0
+        self._quiet_polls = 0
+        self._errors = 0
+        self._last_duration = None
+
+    @property
+    def current(self) -> int:
+        """Return the timeout of the next long-poll, in seconds."""
+        return self._timeout
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the long-poll statistics."""
+        return {
+            "timeout": self._timeout,
+            "polls": self._polls,
+            "quiet_polls": self._quiet_polls,
+            "errors": self._errors,
+            "last_duration": self._last_duration,
+        }
+
+    def next_timeout(self, busy: bool) -> int:
+        """Return the timeout of the next long-poll."""
+        if busy:
+            return min(self._timeout, self._busy)
+        return self._timeout
+
+    def on_result(self, indications: int, duration: float) -> None:
+        """Adapt the timeout to a long-poll result."""
+        with self._lock:
+            self._polls += 1
+            self._last_duration = duration
+            if indications:
+                self._timeout = self._minimum
+            else:
+                self._quiet_polls += 1
+                self._timeout = min(self._maximum, self._timeout * 2)
+
+    def on_error(self) -> None:
+        """Shorten the timeout after a failed long-poll."""
+        with self._lock:
+            self._errors += 1
+            self._timeout = self._minimum
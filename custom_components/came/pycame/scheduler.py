@@ -0,0 +1,146 @@
+"""Priority scheduling of the requests sent to ETI/Domo."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from .const import (
+    BACKGROUND_MAX_WAIT,
+    BACKGROUND_TIMEOUT,
+    INTERACTIVE_TIMEOUT,
+    REFRESH_TIMEOUT,
+)
+from .exceptions import ETIDomoDeadlineError, ETIDomoRequestDroppedError
+from .limiter import AdaptiveLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request priorities, lower goes out first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_REFRESH = 1
+PRIORITY_BACKGROUND = 2
+
+# Default time allowed to a request of each priority
+PRIORITY_TIMEOUTS = {
+    PRIORITY_INTERACTIVE: INTERACTIVE_TIMEOUT,
+    PRIORITY_REFRESH: REFRESH_TIMEOUT,
+    PRIORITY_BACKGROUND: BACKGROUND_TIMEOUT,
+}
+
+
+def request_priority(cmd_name: str) -> int:
+    """Return the default priority of an application command."""
+    if cmd_name.endswith("_list_req"):
+        return PRIORITY_REFRESH
+    return PRIORITY_INTERACTIVE
+
+
+class RequestScheduler:
+    """Hand out the command slots by priority.
+
+    Waiting requests are served by priority, then in arrival order. One slot
+    is reserved to interactive requests, so a user command never waits behind
+    refreshes or telemetry. Background requests which cannot be served within
+    a short time are dropped.
+
+    With a limiter, the usable slots and the request rate follow its limits.
+    Requests still waiting at their deadline are cancelled.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        reserved: int = 1,
+        background_max_wait: float = BACKGROUND_MAX_WAIT,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ):
+        """Init instance."""
+        self._slots = slots
+        self._limiter = limiter
+        self._reserved = min(reserved, slots - 1)
+        self._background_max_wait = background_max_wait
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = []  # type: List[Tuple[int, int]]
+        self._seq = itertools.count()
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests in flight."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of queued requests."""
+        return len(self._waiting)
+
+    def _limit(self, priority: int) -> int:
+        """Return the number of slots usable by a priority."""
+        slots = self._slots
+        if self._limiter is not None:
+            slots = min(slots, self._limiter.concurrency)
+        if priority == PRIORITY_INTERACTIVE:
+            return slots
+        # Under back-off the reserved slot may be the only one left.
+        return max(1, slots - self._reserved)
+
+    def _acquire(self, priority: int, deadline: Optional[float]) -> None:
+        """Wait for a free slot."""
+        ticket = (priority, next(self._seq))
+        drop_at = None
+        if priority >= PRIORITY_BACKGROUND:
+            drop_at = time.monotonic() + self._background_max_wait
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    timeout = None
+                    if (
+                        self._waiting[0] == ticket
+                        and self._active < self._limit(priority)
+                    ):
+                        if self._limiter is None:
+                            break
+                        timeout = self._limiter.reserve()
+                        if not timeout:
+                            break
+                    now = time.monotonic()
+                    if deadline is not None:
+                        if deadline <= now:
+                            raise ETIDomoDeadlineError()
+                        timeout = min(timeout or deadline - now, deadline - now)
+                    if drop_at is not None:
+                        if drop_at <= now:
+                            raise ETIDomoRequestDroppedError()
+                        timeout = min(timeout or drop_at - now, drop_at - now)
+                    self._cond.wait(timeout)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiting)
+            self._active += 1
+            # The next waiter may fit in another free slot.
+            self._cond.notify_all()
+
+    def _release(self) -> None:
+        """Free a slot."""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int, deadline: Optional[float] = None) -> Iterator[None]:
+        """Hold a slot for the duration of a request."""
+        self._acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self._release()
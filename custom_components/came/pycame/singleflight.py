@@ -0,0 +1,117 @@
+"""Deduplicated read requests for ETI/Domo."""
+
+import copy
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .const import READ_JOIN_MIN_TIME, READ_MAX_AGE
+from .deadline import time_left
+from .pending import PendingResult
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def is_read_request(command: dict) -> bool:
+    """Return True if the command only reads state from the ETI/Domo."""
+    return command.get("cmd_name", "").endswith("_list_req")
+
+
+def read_key(command: dict, resp_command: str) -> str:
+    """Return the key identifying a read request."""
+    return json.dumps([command, resp_command], sort_keys=True)
+
+
+class _InFlightRead(PendingResult):
+    """A read request shared by all the callers that joined it."""
+
+    def __init__(self, priority: int, deadline: Optional[float]):
+        """Init instance."""
+        super().__init__()
+        self.priority = priority
+        self.deadline = deadline
+
+    def serves(self, priority: int) -> bool:
+        """Return True if this read is as urgent and not about to expire."""
+        if self.priority > priority:
+            return False
+        remaining = time_left(self.deadline)
+        return remaining is None or remaining >= READ_JOIN_MIN_TIME
+
+
+class SingleFlight:
+    """Share the response of identical read requests.
+
+    A caller joins an identical read already in flight, unless that read has a
+    lower priority or is about to miss its deadline. Each caller still waits
+    only until its own deadline. Callers may also accept the last response if
+    it is recent enough, responses older than max_age are dropped.
+
+    Every caller gets its own copy of the response.
+    """
+
+    def __init__(self, max_age: float = READ_MAX_AGE):
+        """Init instance."""
+        self._lock = threading.Lock()
+        self._in_flight = {}  # type: Dict[str, _InFlightRead]
+        self._last = {}  # type: Dict[str, Tuple[float, dict]]
+        self._max_age = max_age
+        self.shared = 0
+
+    def _evict(self, now: float) -> None:
+        """Drop the responses too old to be reused."""
+        expired = [
+            key
+            for key, (received, _) in self._last.items()
+            if now - received > self._max_age
+        ]
+        for key in expired:
+            del self._last[key]
+
+    def fetch(
+        self,
+        key: str,
+        send: Callable[[Optional[float]], dict],
+        priority: int,
+        max_age: float = 0,
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """Return the response of a read, sending it only if needed."""
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            if max_age > 0 and key in self._last:
+                received, response = self._last[key]
+                if now - received <= max_age:
+                    self.shared += 1
+                    return copy.deepcopy(response)
+
+            pending = self._in_flight.get(key)
+            if pending is not None and pending.serves(priority):
+                self.shared += 1
+                leader = False
+            else:
+                pending = self._in_flight[key] = _InFlightRead(priority, deadline)
+                leader = True
+
+        if not leader:
+            return copy.deepcopy(pending.wait(deadline))
+
+        try:
+            response = send(deadline)
+        except BaseException as err:
+            with self._lock:
+                if self._in_flight.get(key) is pending:
+                    self._in_flight.pop(key)
+            pending.set_error(err)
+            raise
+
+        with self._lock:
+            if self._in_flight.get(key) is pending:
+                self._in_flight.pop(key)
+            self._last[key] = (time.monotonic(), response)
+
+        pending.set_result(response)
+        return copy.deepcopy(response)
@@ -0,0 +1,127 @@
+"""Coalesced device commands for ETI/Domo."""
+
+import logging
+import threading
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from .deadline import time_left
+from .exceptions import ETIDomoDeadlineError
+from .pending import PendingResult
+
+_LOGGER = logging.getLogger(__name__)
+
+# Commands which set the whole wanted state of a device
+COALESCED_COMMANDS = (
+    "light_switch_req",
+    "relay_activation_req",
+    "opening_move_req",
+    "thermo_zone_config_req",
+)
+
+
+def write_key(command: dict) -> Optional[Tuple[str, int]]:
+    """Return the coalescing key of a command, None if it can't be merged."""
+    cmd_name = command.get("cmd_name")
+    act_id = command.get("act_id")
+    if cmd_name not in COALESCED_COMMANDS or act_id is None:
+        return None
+    return cmd_name, act_id
+
+
+def merge_commands(queued: dict, newer: dict) -> dict:
+    """Merge a newer command into a queued one, the last write wins."""
+    merged = {**queued, **newer}
+    if "extended_infos" in queued:
+        # Keep the extended fields (season, fan speed) of the queued command.
+        merged["extended_infos"] = max(
+            queued["extended_infos"], newer.get("extended_infos", 0)
+        )
+    return merged
+
+
+class _QueuedWrite(PendingResult):
+    """A command waiting for the previous one to the same device."""
+
+    def __init__(self, command: dict, deadline: Optional[float]):
+        """Init instance."""
+        super().__init__()
+        self.command = command
+        self.deadline = deadline
+
+    def merge(self, command: dict, deadline: Optional[float]) -> None:
+        """Merge a newer command, which extends the deadline."""
+        self.command = merge_commands(self.command, command)
+        if self.deadline is not None:
+            self.deadline = None if deadline is None else max(self.deadline, deadline)
+
+
+class WriteCoalescer:
+    """Send the commands to a device one at a time, merging the queued ones.
+
+    While a command to a device is in flight, the newer commands of the same
+    kind are merged into a single queued command, which is sent once the
+    previous one is done. Every merged caller receives the reply of the
+    command which carried its write.
+
+    A queued command is sent within the latest deadline of its callers,
+    or dropped once that deadline has passed.
+    """
+
+    def __init__(self):
+        """Init instance."""
+        self._cond = threading.Condition()
+        self._in_flight = set()  # type: Set[Hashable]
+        self._queued = {}  # type: Dict[Hashable, _QueuedWrite]
+        self.merged = 0
+
+    def submit(
+        self,
+        command: dict,
+        send: Callable[[dict, Optional[float]], dict],
+        deadline: Optional[float] = None,
+    ) -> dict:
+        """Send a command through the given function, or merge it."""
+        key = write_key(command)
+        if key is None:
+            return send(command, deadline)
+
+        with self._cond:
+            queued = self._queued.get(key)
+            if queued is not None:
+                queued.merge(command, deadline)
+                self.merged += 1
+                _LOGGER.debug("Merge %s for act_id %s", *key)
+                leader = False
+            else:
+                queued = self._queued[key] = _QueuedWrite(command, deadline)
+                leader = True
+                try:
+                    while key in self._in_flight:
+                        timeout = time_left(queued.deadline)
+                        if timeout is not None and timeout <= 0:
+                            raise ETIDomoDeadlineError()
+                        self._cond.wait(timeout)
+                except BaseException as err:
+                    del self._queued[key]
+                    queued.set_error(err)
+                    raise
+                del self._queued[key]
+                self._in_flight.add(key)
+                command = queued.command
+                deadline = queued.deadline
+
+        if not leader:
+            return queued.wait(deadline)
+
+        try:
+            response = send(command, deadline)
+        except BaseException as err:
+            queued.set_error(err)
+            raise
+        finally:
+            with self._cond:
+                self._in_flight.discard(key)
+                self._cond.notify_all()
+
+        queued.set_result(response)
+        return response
@@ -2,13 +2,14 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import List
 
 from homeassistant.components.scene import Scene
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_ON, STATE_OFF, STATE_UNAVAILABLE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 
@@ -29,7 +30,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     _existing_scenario_entities = hass.data[DOMAIN]["came_scenarios"]
     existing_entities = hass.data[DOMAIN]["came_scenarios"]
 
-    def create_new_entities(scenarios):
+    def create_new_entities(scenarios, fetched: float):
         _LOGGER.debug("Entità già registrate: %s", list(_existing_scenario_entities.keys()))
         entities = []
         for scenario in scenarios:
@@ -49,7 +50,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                 else:
                     _LOGGER.debug("create_new_entities: (ri)creo scenario statico id %s nome %s", sid, scenario.get("name"))
 
-                entity = CameScenarioEntity(scenario, manager)
+                entity = CameScenarioEntity(scenario, manager, fetched)
                 _existing_scenario_entities[sid] = entity
                 entities.append(entity)
             else:
@@ -59,9 +60,10 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
 
     # Crea le entità iniziali
+    fetched = time.monotonic()
     scenarios = await hass.async_add_executor_job(manager.scenario_manager.get_scenarios)
     _LOGGER.debug("Setup iniziale scenari: caricati %d scenari", len(scenarios))
-    entities = create_new_entities(scenarios)
+    entities = create_new_entities(scenarios, fetched)
     async_add_entities(entities)
 
     # Funzione che ascolta l'evento refresh per aggiungere nuove entità dinamicamente
@@ -69,6 +71,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         _LOGGER.debug("Ricevuto evento came_scenarios_refreshed, controllo nuovi scenari...")
         #_LOGGER.debug("Entità già registrate: %s", list(_existing_scenario_entities.keys()))
 
+        fetched = time.monotonic()
         scenarios = await hass.async_add_executor_job(manager.scenario_manager.get_scenarios)
 
         # Fai una copia degli id esistenti PRIMA di aggiungere nuovi
@@ -102,7 +105,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                 
 
         # Trova nuove entità da aggiungere
-        new_entities = create_new_entities(scenarios)
+        new_entities = create_new_entities(scenarios, fetched)
         if new_entities:
             _LOGGER.debug("Aggiungo %d nuovi scenari", len(new_entities))
             async_add_entities(new_entities, update_before_add=True)
@@ -133,9 +136,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 class CameScenarioEntity(Scene):
     """Rappresentazione di uno scenario CAME."""
 
-    def __init__(self, scenario, manager: CameManager):
+    def __init__(self, scenario, manager: CameManager, fetched: float):
         self._manager = manager
         self._scenario = scenario
+        # Istante della richiesta della lista da cui è stato creato lo scenario
+        self._fetched = fetched
         self._attr_name = scenario.get("name", "Unknown Scenario")
         self._attr_unique_id = f"came_scenario_{scenario['id']}"
         self._unsub = None
@@ -166,14 +171,24 @@ class CameScenarioEntity(Scene):
         """Collega l'entità agli aggiornamenti di stato."""
         from homeassistant.helpers.dispatcher import async_dispatcher_connect
         
+        @callback
         def handle_update(scenario_id: int, new_data: dict):
+            # Eseguito nel loop, insieme agli altri aggiornamenti del batch
             if scenario_id == self._scenario["id"]:
                 _LOGGER.debug("Ricevuto aggiornamento scenario %s: %s", scenario_id, new_data)
-                asyncio.run_coroutine_threadsafe(
-                    self.update_state(new_data), self.hass.loop
-                )
+                self._scenario.update(new_data)
+                self.async_write_ha_state()
 
         self._unsub = async_dispatcher_connect(self.hass, "came_scenario_update", handle_update)
+
+        # Recupera gli stati arrivati dopo la lettura della lista, ma prima
+        # della creazione dell'entità
+        self._manager.history.replay(
+            self._scenario.update,
+            lambda info: info.get("cmd_name") == "scenario_status_ind"
+            and info.get("id") == self._scenario["id"],
+            since=self._fetched,
+        )
         
     async def async_will_remove_from_hass(self):
         """Clean up dispatcher listener on removal."""
@@ -182,11 +197,6 @@ class CameScenarioEntity(Scene):
             self._unsub = None
         
         
-    async def update_state(self, new_data: dict):
-        """Aggiorna lo stato dello scenario."""
-        self._scenario.update(new_data)
-        self.async_write_ha_state()
-        
     @property
     def is_active(self):
         """Return True if scenario is active."""
@@ -1,6 +1,8 @@
 """Support for the CAME analog sensors."""
 
 import logging
+from typing import Optional
+
 from homeassistant.components.sensor import (
     DOMAIN as SENSOR_DOMAIN,
     ENTITY_ID_FORMAT,
@@ -10,7 +12,7 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import StateType
@@ -19,6 +21,7 @@ from homeassistant.util.unit_system import PRESSURE_UNITS, TEMPERATURE_UNITS
 
 from .pycame.came_manager import CameManager
 from .pycame.devices import CameDevice
+from .pycame.devices.base import StateDelta
 from .pycame.devices.came_energy_sensor import CameEnergySensor
 from .const import CONF_MANAGER, CONF_PENDING, DOMAIN, SIGNAL_DISCOVERY_NEW
 from .entity import CameEntity
@@ -103,7 +106,6 @@ class CameEnergySensorEntity(CameEntity, SensorEntity):
     def __init__(self, device: CameDevice):
         """Init CAME energy sensor device entity."""
         super().__init__(device)
-        device.hass_entity = self
         self.entity_id = ENTITY_ID_FORMAT.format(self.unique_id)
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_device_class = SensorDeviceClass.POWER
@@ -145,6 +147,7 @@ class CameEnergyTotalSensorEntity(CameEntity, SensorEntity, RestoreEntity):
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_native_unit_of_measurement = "kWh"
         self._last_time = None
+        self._last_power = None
         self._energy_total = 0.0
 
     async def async_added_to_hass(self):
@@ -157,13 +160,24 @@ class CameEnergyTotalSensorEntity(CameEntity, SensorEntity, RestoreEntity):
             except (ValueError, TypeError):
                 self._energy_total = 0.0
 
-    def update(self):
+    def _integrate(self):
+        """Add the energy of the power held since the last step."""
         now = dt_util.utcnow()
-        power = self._source_entity.native_value
+        power = self._last_power
         if self._last_time is not None and isinstance(power, (int, float)):
             elapsed_hours = (now - self._last_time).total_seconds() / 3600
             self._energy_total += (power * elapsed_hours) / 1000  # da W a kWh
         self._last_time = now
+        self._last_power = self._source_entity.native_value
+
+    def update(self):
+        self._integrate()
+
+    @callback
+    def _device_update_callback(self, delta: Optional[StateDelta] = None):
+        """Integrate the power pushed by the energy poller, then write."""
+        self._integrate()
+        self.async_write_ha_state()
 
     @property
     def native_value(self):
@@ -0,0 +1,66 @@
+"""Compare the CPU cost of the ETI/Domo codecs on a plant-sized list response.
+
+Run from the repository root: python scripts/codec_benchmark.py
+"""
+
+import json
+import os
+import sys
+import time
+
+# Import the client library alone, without the Home Assistant integration.
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "custom_components", "came")
+)
+
+from pycame import codec  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def sample_response(devices: int) -> bytes:
+    """Build a light_list_resp of the given size."""
+    return json.dumps(
+        {
+            "sl_cmd": "sl_data_ack",
+            "sl_data_ack_reason": 0,
+            "cmd_name": "light_list_resp",
+            "array": [
+                {
+                    "act_id": act_id,
+                    "name": f"Luce {act_id}",
+                    "floor_ind": act_id % 3,
+                    "room_ind": act_id % 12,
+                    "status": act_id % 2,
+                    "type": "DIMMER",
+                    "perc": act_id % 100,
+                }
+                for act_id in range(devices)
+            ],
+        }
+    ).encode()
+
+
+def benchmark(devices: int = 200, rounds: int = 2000) -> None:
+    """Print the CPU time per request of each codec."""
+    body = sample_response(devices)
+    command = {
+        "sl_cmd": "sl_data_req",
+        "sl_client_id": "0123456789abcdef",
+        "sl_appl_msg": {"cmd_name": "light_switch_req", "act_id": 1, "wanted_status": 1},
+    }
+    # pylint: disable=protected-access
+    codecs = {"json": (codec._json_dumps, codec._json_loads)}
+    if codec.orjson is not None:
+        codecs["orjson"] = (codec._orjson_dumps, codec._orjson_loads)
+
+    print(f"Response of {devices} devices, {len(body)} bytes")
+    for name, (encode, decode) in codecs.items():
+        start = time.process_time()
+        for _ in range(rounds):
+            encode(command)
+            decode(body)
+        elapsed = (time.process_time() - start) / rounds
+        print(f"{name:>8}: {elapsed * 1e6:.1f} us per request")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,81 @@
+"""Fixtures for the ETI/Domo client tests."""
+
+import copy
+from collections import deque
+
+import pytest
+
+from custom_components.came.pycame.came_manager import CameManager
+
+
+def light(act_id: int, name: str, status: int = 0, **fields) -> dict:
+    """Return the state of a light as listed by the ETI/Domo."""
+    return {
+        "act_id": act_id,
+        "name": name,
+        "floor_ind": 0,
+        "room_ind": 1,
+        "status": status,
+        "type": "STEP_STEP",
+        **fields,
+    }
+
+
+class FakePlant:
+    """ETI/Domo plant answering the application layer requests."""
+
+    def __init__(self, lights=(), serial="0001", swver="1.0"):
+        """Init instance."""
+        self.serial = serial
+        self.swver = swver
+        self.lights = [dict(info) for info in lights]
+        self.indications = deque()
+        self.requests = []
+
+    def replies(self) -> dict:
+        """Return the replies by request name."""
+        return {
+            "feature_list_req": {
+                "cmd_name": "feature_list_resp",
+                "list": ["lights"],
+                "serial": self.serial,
+                "swver": self.swver,
+                "keycode": "KEY",
+            },
+            "floor_list_req": {
+                "cmd_name": "floor_list_resp",
+                "floor_list": [{"floor_ind": 0, "name": "Piano terra"}],
+            },
+            "room_list_req": {
+                "cmd_name": "room_list_resp",
+                "room_list": [{"room_ind": 1, "name": "Cucina", "floor_ind": 0}],
+            },
+            "light_list_req": {"cmd_name": "light_list_resp", "array": self.lights},
+        }
+
+    def request(self, command: dict, resp_command: str = None, *args, **kwargs) -> dict:
+        """Answer a request, status updates return the queued indications."""
+        cmd_name = command["cmd_name"]
+        self.requests.append(cmd_name)
+        if cmd_name == "status_update_req":
+            result = list(self.indications)
+            self.indications.clear()
+            return {"cmd_name": "status_update_resp", "result": result}
+        # A fresh reply each time, as decoded from the wire.
+        return copy.deepcopy(self.replies()[cmd_name])
+
+
+@pytest.fixture
+def plant():
+    """Return a plant with two lights."""
+    return FakePlant([light(1, "Cucina"), light(2, "Sala", status=1)])
+
+
+@pytest.fixture
+def manager(plant, monkeypatch):
+    """Return a manager talking to the fake plant, already logged in."""
+    manager = CameManager("127.0.0.1", "user", "password", "token")
+    manager._client_id = "session"  # pylint: disable=protected-access
+    monkeypatch.setattr(manager, "_application_request", plant.request)
+    yield manager
+    manager.close()
@@ -0,0 +1,98 @@
+"""Tests for the circuit breaker of the ETI/Domo connection."""
+
+import time
+
+import pytest
+
+from custom_components.came.pycame.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+from custom_components.came.pycame.exceptions import (
+    ETIDomoCircuitOpenError,
+    ETIDomoConnectionError,
+    ETIDomoError,
+)
+
+
+def _fail(breaker: CircuitBreaker, error: Exception) -> None:
+    """Run a request failing with the given error."""
+    with pytest.raises(type(error)):
+        with breaker.guard():
+            raise error
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    """Open the circuit with consecutive connection failures."""
+    for _ in range(3):
+        _fail(breaker, ETIDomoConnectionError("down"))
+
+
+def test_opens_after_consecutive_failures():
+    """The circuit opens on the last allowed failure and then fails fast."""
+    changes = []
+    breaker = CircuitBreaker(failures=3, base_delay=10, on_change=changes.append)
+
+    _fail(breaker, ETIDomoConnectionError("down"))
+    _fail(breaker, ETIDomoConnectionError("down"))
+    assert breaker.state == STATE_CLOSED
+
+    _fail(breaker, ETIDomoConnectionError("down"))
+    assert breaker.state == STATE_OPEN
+    assert changes == [STATE_OPEN]
+    assert 5 <= breaker.retry_after <= 10
+
+    with pytest.raises(ETIDomoCircuitOpenError):
+        with breaker.guard():
+            pass
+
+
+def test_other_errors_do_not_count():
+    """Errors unrelated to the connection leave the circuit closed."""
+    breaker = CircuitBreaker(failures=1)
+
+    _fail(breaker, ETIDomoError("bad reply"))
+    assert breaker.state == STATE_CLOSED
+
+
+def test_probe_success_closes_the_circuit():
+    """Once the delay has passed, one probe goes through and closes it."""
+    changes = []
+    breaker = CircuitBreaker(failures=3, base_delay=0.05, on_change=changes.append)
+    _open(breaker)
+    time.sleep(0.06)
+    assert breaker.state == STATE_HALF_OPEN
+
+    with breaker.guard():
+        # A single probe at a time.
+        with pytest.raises(ETIDomoCircuitOpenError):
+            with breaker.guard():
+                pass
+
+    assert breaker.state == STATE_CLOSED
+    assert changes == [STATE_OPEN, STATE_CLOSED]
+
+
+def test_probe_failure_backs_off_longer():
+    """A failed probe opens the circuit again for a longer delay."""
+    breaker = CircuitBreaker(failures=3, base_delay=0.05, max_delay=10)
+    _open(breaker)
+    time.sleep(0.06)
+
+    _fail(breaker, ETIDomoConnectionError("still down"))
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_after > 0.05 * 0.5
+
+
+def test_aborted_probe_released():
+    """A probe ending with an unrelated error lets the next one through."""
+    breaker = CircuitBreaker(failures=3, base_delay=0.05)
+    _open(breaker)
+    time.sleep(0.06)
+
+    _fail(breaker, ETIDomoError("bad reply"))
+    with breaker.guard():
+        pass
+    assert breaker.state == STATE_CLOSED
@@ -0,0 +1,155 @@
+"""Tests for the ETI/Domo client against a local fake server."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from custom_components.came.pycame.breaker import STATE_OPEN
+from custom_components.came.pycame.came_manager import CameManager
+from custom_components.came.pycame.const import READ_TIMEOUT
+from custom_components.came.pycame.exceptions import (
+    ETIDomoCircuitOpenError,
+    ETIDomoConnectionTimeoutError,
+    ETIDomoDeadlineError,
+)
+from custom_components.came.pycame.scheduler import PRIORITY_TIMEOUTS
+
+# The fake server listens on the loopback interface.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+SESSION_REJECTED = b'{"sl_cmd": "sl_data_ack", "sl_data_ack_reason": 8}'
+
+
+class FakeServer:
+    """ETI/Domo which replies to the first requests, then hangs."""
+
+    def __init__(self, replies=()):
+        """Init instance."""
+        self._replies = list(replies)
+        self._lock = threading.Lock()
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self._connections = []
+        self._threads = [threading.Thread(target=self._accept, daemon=True)]
+        self.host = "127.0.0.1:{}".format(self._sock.getsockname()[1])
+        self._threads[0].start()
+
+    def _accept(self):
+        """Serve every connection in its own thread."""
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self._connections.append(conn)
+            thread = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _serve(self, conn):
+        """Reply while there are replies left, then keep the request hanging."""
+        try:
+            while conn.recv(65536):
+                with self._lock:
+                    body = self._replies.pop(0) if self._replies else None
+                if body is None:
+                    continue
+                conn.sendall(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s"
+                    % (len(body), body)
+                )
+        except OSError:
+            pass
+
+    def close(self):
+        """Stop serving and wait for the server threads."""
+        for sock in [self._sock] + self._connections:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        for thread in self._threads:
+            thread.join()
+
+
+@pytest.fixture
+def server():
+    """Return a fake ETI/Domo, closed after the test."""
+    servers = []
+
+    def factory(replies=()):
+        servers.append(FakeServer(replies))
+        return servers[-1]
+
+    yield factory
+    for fake in servers:
+        fake.close()
+
+
+def _manager(host: str, read_timeout: float) -> CameManager:
+    """Return a manager with an open session."""
+    manager = CameManager(host, "user", "password", "token", read_timeout=read_timeout)
+    manager._client_id = "session"  # pylint: disable=protected-access
+    return manager
+
+
+def _switch(act_id: int) -> dict:
+    """Return a light switch command."""
+    return {"cmd_name": "light_switch_req", "act_id": act_id, "wanted_status": 1}
+
+
+def test_read_timeout_below_request_deadlines():
+    """A hung ETI/Domo times out before the default deadline of any request."""
+    assert READ_TIMEOUT < min(PRIORITY_TIMEOUTS.values())
+
+
+def test_hung_server_opens_the_circuit(server):
+    """Read timeouts within the deadline count as connection failures."""
+    manager = _manager(server().host, read_timeout=0.2)
+    errors = []
+
+    def command(act_id):
+        try:
+            manager.application_request(_switch(act_id), timeout=2)
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append(type(err))
+
+    threads = [threading.Thread(target=command, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    manager.close()
+
+    assert errors.count(ETIDomoConnectionTimeoutError) == 3
+    assert ETIDomoCircuitOpenError in errors
+    assert manager.health == STATE_OPEN
+    assert manager._limiter.concurrency == 1  # pylint: disable=protected-access
+
+
+def test_timeout_cut_short_by_deadline(server):
+    """A read timeout shortened by the deadline is a missed deadline."""
+    manager = _manager(server().host, read_timeout=5)
+
+    with pytest.raises(ETIDomoDeadlineError):
+        manager.application_request(_switch(1), timeout=0.2)
+    manager.close()
+
+    assert manager.health != STATE_OPEN
+    assert manager.deadline_misses["light_switch_req"] == 1
+
+
+def test_relogin_bounded_by_deadline(server):
+    """A re-login after a rejected session doesn't outlive the request."""
+    manager = _manager(server([SESSION_REJECTED]).host, read_timeout=5)
+
+    start = time.monotonic()
+    with pytest.raises(ETIDomoDeadlineError):
+        manager.application_request(_switch(1), timeout=0.5)
+    manager.close()
+
+    assert time.monotonic() - start < 1.5
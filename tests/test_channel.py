@@ -0,0 +1,54 @@
+"""Tests for the HTTP channels."""
+
+import requests
+
+from custom_components.came.pycame.came_manager import CameManager
+from custom_components.came.pycame.channel import Channel, ChannelPool
+from custom_components.came.pycame.const import COMMAND_CHANNELS
+from custom_components.came.pycame.scheduler import PRIORITY_BACKGROUND
+
+
+def test_caller_session_left_alone():
+    """A channel takes the settings of the caller's session, not the session."""
+    session = requests.Session()
+    session.headers["X-Test"] = "1"
+    adapter = session.get_adapter("http://127.0.0.1/")
+
+    pool = ChannelPool("command", 2, session)
+
+    assert session.get_adapter("http://127.0.0.1/") is adapter
+    for channel in pool:
+        # pylint: disable=protected-access
+        assert channel._session is not session
+        assert channel._session.headers["X-Test"] == "1"
+    pool.close()
+    session.close()
+
+
+def test_channel_keeps_one_connection():
+    """Every channel pools a single connection, without retries."""
+    channel = Channel("status")
+    # pylint: disable=protected-access
+    adapter = channel._session.get_adapter("http://127.0.0.1/")
+
+    assert adapter._pool_maxsize == 1
+    assert adapter.max_retries.total == 0
+    channel.close()
+
+
+def test_warm_up_is_a_background_request(monkeypatch):
+    """The warm up probes go through the scheduler with background priority."""
+    manager = CameManager("127.0.0.1", "user", "password", "token")
+    manager._client_id = "session"  # pylint: disable=protected-access
+    priorities = []
+
+    def scheduled_request(command, resp_command, priority, deadline):
+        priorities.append(priority)
+        return {"sl_cmd": "sl_data_ack", "cmd_name": "feature_list_resp"}
+
+    monkeypatch.setattr(manager, "_scheduled_request", scheduled_request)
+
+    manager.warm_up()
+    manager.close()
+
+    assert priorities == [PRIORITY_BACKGROUND] * COMMAND_CHANNELS
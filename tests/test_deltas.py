@@ -0,0 +1,77 @@
+"""Tests for the field-level deltas of the device updates."""
+
+from custom_components.came.climate import CameClimateEntity
+from custom_components.came.pycame.devices import CameThermo
+from custom_components.came.pycame.devices.base import merge_deltas
+
+
+def _indication(act_id: int, **fields) -> dict:
+    """Return a light status indication."""
+    return {"cmd_name": "light_switch_ind", "act_id": act_id, **fields}
+
+
+def test_first_update_reports_every_device(manager):
+    """The discovery reports a whole new state for each device."""
+    updated = manager.status_update(timeout=0)
+
+    assert updated == dict.fromkeys(d.unique_id for d in manager.get_all_devices())
+
+
+def test_status_update_reports_the_changed_fields(manager, plant):
+    """Only the devices and fields which have changed are reported."""
+    manager.get_all_devices()
+    kitchen = manager.get_device_by_act_id(1)
+    plant.indications.extend(
+        [_indication(1, status=1), _indication(2, status=1), _indication(3, status=1)]
+    )
+
+    assert manager.status_update(timeout=0) == {kitchen.unique_id: {"status": (0, 1)}}
+
+
+def test_deltas_of_a_batch_are_merged(manager, plant):
+    """Successive indications of a device keep the first old value."""
+    manager.get_all_devices()
+    kitchen = manager.get_device_by_act_id(1)
+    plant.indications.extend(
+        [_indication(1, status=1), _indication(1, status=0, perc=40)]
+    )
+
+    assert manager.status_update(timeout=0) == {
+        kitchen.unique_id: {"status": (0, 0), "perc": (None, 40)}
+    }
+
+
+def test_merge_with_unknown_change():
+    """Any change merged with a whole new state is a whole new state."""
+    assert merge_deltas(None, {"status": (0, 1)}) is None
+    assert merge_deltas({"status": (0, 1)}, None) is None
+
+
+def _climate(monkeypatch) -> tuple:
+    """Return a climate entity and the list of its state writes."""
+    device = CameThermo(
+        None, {"act_id": 5, "name": "Soggiorno", "temp": 205, "set_point": 210}
+    )
+    entity = CameClimateEntity(device)
+    writes = []
+    monkeypatch.setattr(entity, "async_write_ha_state", lambda: writes.append(1))
+    return entity, writes
+
+
+def test_climate_writes_shown_fields_only(monkeypatch):
+    """Fields the climate entity doesn't show don't write its state."""
+    entity, writes = _climate(monkeypatch)
+
+    # pylint: disable=protected-access
+    entity._device_update_callback({"floor_ind": (0, 1), "f3a": (None, {})})
+    assert not writes
+
+    for delta in (
+        {"temp": (205, 210)},
+        {"set_point": (210, 200)},
+        {"fan_speed": (1, 2)},
+        {"name": ("Soggiorno", "Salotto")},
+        None,
+    ):
+        entity._device_update_callback(delta)
+    assert len(writes) == 5
@@ -0,0 +1,40 @@
+"""Tests for the device lookup tables."""
+
+from custom_components.came.pycame.came_manager import DeviceIndex
+from custom_components.came.pycame.devices import CameLight
+
+from .conftest import light
+
+
+def test_lookups_discover_the_plant_once(manager, plant):
+    """The first lookup discovers the devices, the next ones use the index."""
+    device = manager.get_device_by_act_id(2)
+
+    assert device.name == "Sala"
+    assert manager.get_device_by_name("Sala") is device
+    assert manager.get_device_by_id(device.unique_id) is device
+    assert manager.get_device_by_act_id(3) is None
+    assert manager.get_device_by_name("Bagno") is None
+    assert plant.requests.count("light_list_req") == 1
+
+
+def test_first_device_wins_on_duplicated_keys():
+    """Devices sharing a name or act ID don't replace the first one."""
+    first = CameLight(None, light(1, "Cucina"))
+    same_name = CameLight(None, light(2, "Cucina"))
+    same_act_id = CameLight(None, light(1, "Sala"))
+
+    index = DeviceIndex.from_devices([first, same_name, same_act_id])
+
+    assert index.by_name["Cucina"] is first
+    assert index.by_act_id[1] is first
+    assert index.by_id[first.unique_id] is first
+    assert index.by_act_id[2] is same_name
+
+
+def test_devices_without_act_id_are_not_indexed_by_it():
+    """Only the devices with an act ID can be found by it."""
+    index = DeviceIndex.from_devices([CameLight(None, light(None, "Cucina"))])
+
+    assert not index.by_act_id
+    assert "Cucina" in index.by_name
@@ -0,0 +1,38 @@
+"""Tests for the status indication history."""
+
+from custom_components.came.pycame.history import StatusHistory
+
+
+def test_oldest_indications_overwritten():
+    """The ring buffer keeps the most recent indications, oldest first."""
+    history = StatusHistory(3)
+    for act_id in range(5):
+        history.record({"act_id": act_id}, float(act_id), 0.001)
+
+    assert len(history) == 3
+    assert [entry[0]["act_id"] for entry in history] == [2, 3, 4]
+
+
+def test_replay_filters_by_predicate_and_time():
+    """Only the matching indications received since the given time replay."""
+    history = StatusHistory(8)
+    for act_id in range(6):
+        history.record({"act_id": act_id}, float(act_id), 0.001)
+
+    replayed = []
+    count = history.replay(
+        replayed.append, lambda info: info["act_id"] % 2 == 0, since=1.0
+    )
+
+    assert count == 2
+    assert replayed == [{"act_id": 2}, {"act_id": 4}]
+
+
+def test_dump():
+    """The diagnostics dump carries the timings with each indication."""
+    history = StatusHistory(2)
+    history.record({"act_id": 1}, 10.0, 0.5)
+
+    assert history.dump() == [
+        {"received": 10.0, "latency": 0.5, "indication": {"act_id": 1}}
+    ]
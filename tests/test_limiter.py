@@ -0,0 +1,39 @@
+"""Tests for the adaptive limiter of the ETI/Domo requests."""
+
+from custom_components.came.pycame.limiter import AdaptiveLimiter
+
+
+def test_window_halves_on_overload_and_widens_on_success():
+    """The AIMD window backs off multiplicatively and recovers additively."""
+    limiter = AdaptiveLimiter(4, rate=10.0, latency_target=1.0)
+    assert limiter.concurrency == 4
+
+    limiter.on_overload()
+    assert limiter.concurrency == 2
+    assert limiter.rate == 5.0
+
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.concurrency == 1
+
+    for _ in range(10):
+        limiter.on_success(0.1)
+    assert limiter.concurrency == 4
+
+
+def test_slow_replies_do_not_widen_the_window():
+    """Only replies within the latency target count as healthy."""
+    limiter = AdaptiveLimiter(4, latency_target=1.0)
+    limiter.on_overload()
+
+    limiter.on_success(2.0)
+    assert limiter.concurrency == 2
+
+
+def test_token_bucket_paces_the_requests():
+    """Once the burst is spent, the next token comes at the current rate."""
+    limiter = AdaptiveLimiter(2, rate=1.0)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert 0 < limiter.reserve() <= 1.0
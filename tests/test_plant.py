@@ -0,0 +1,85 @@
+"""Tests for the plant discovery cache."""
+
+import json
+
+import pytest
+
+from custom_components.came.pycame.came_manager import CameManager
+
+from .conftest import FakePlant, light
+
+
+@pytest.fixture
+def restored(monkeypatch):
+    """Return a factory of managers restored from a cached plant."""
+    managers = []
+
+    def restore(data, live_plant):
+        manager = CameManager("127.0.0.1", "user", "password", "token")
+        manager._client_id = "session"  # pylint: disable=protected-access
+        monkeypatch.setattr(manager, "_application_request", live_plant.request)
+        manager.restore_plant(json.loads(json.dumps(data)))
+        managers.append(manager)
+        return manager
+
+    yield restore
+    for manager in managers:
+        manager.close()
+
+
+def test_restore_sends_no_request(manager, plant, restored):
+    """The cached plant rebuilds the devices, floors and rooms offline."""
+    manager.get_all_floors()
+    manager.get_all_rooms()
+    manager.get_all_devices()
+    live = FakePlant(plant.lights)
+
+    cached_manager = restored(manager.export_plant(), live)
+
+    assert [d.unique_id for d in cached_manager.get_all_devices()] == [
+        d.unique_id for d in manager.get_all_devices()
+    ]
+    assert cached_manager.get_device_by_act_id(2).state == 1
+    assert [room.name for room in cached_manager.get_all_rooms()] == ["Cucina"]
+    assert cached_manager.serial == "0001"
+    assert not live.requests
+
+
+def test_rediscover_keeps_the_restored_devices(manager, plant, restored):
+    """Entities bound to the cached devices stay valid after the live discovery."""
+    manager.get_all_devices()
+    live = FakePlant(plant.lights)
+    cached_manager = restored(manager.export_plant(), live)
+    cached = cached_manager.get_device_by_act_id(1)
+
+    changes = cached_manager.rediscover()
+
+    assert not changes
+    assert cached_manager.get_device_by_act_id(1) is cached
+
+
+def test_another_plant_replaces_the_cache(manager, plant, restored):
+    """A different ETI/Domo at the same address rebuilds every device."""
+    manager.get_all_devices()
+    live = FakePlant(plant.lights, serial="0002")
+    cached_manager = restored(manager.export_plant(), live)
+    cached = cached_manager.get_device_by_act_id(1)
+
+    changes = cached_manager.rediscover()
+
+    assert changes.added == changes.removed == {
+        d.unique_id for d in manager.get_all_devices()
+    }
+    assert cached_manager.get_device_by_act_id(1) is not cached
+
+
+def test_new_device_in_the_live_plant(manager, plant, restored):
+    """Devices missing from the cache are reported as added."""
+    manager.get_all_devices()
+    live = FakePlant(plant.lights + [light(3, "Bagno")])
+    cached_manager = restored(manager.export_plant(), live)
+
+    changes = cached_manager.rediscover()
+
+    assert changes.added == {cached_manager.get_device_by_act_id(3).unique_id}
+    assert not changes.removed
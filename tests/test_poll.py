@@ -0,0 +1,40 @@
+"""Tests for the adaptive status long-poll timeout."""
+
+from custom_components.came.pycame.poll import PollTimeoutTuner
+
+
+def test_timeout_doubles_while_quiet():
+    """Quiet polls lengthen the timeout up to the maximum."""
+    tuner = PollTimeoutTuner(minimum=5, maximum=30, busy=2)
+
+    timeouts = []
+    for _ in range(4):
+        timeouts.append(tuner.next_timeout(busy=False))
+        tuner.on_result(0, 1.0)
+
+    assert timeouts == [5, 10, 20, 30]
+    assert tuner.stats["quiet_polls"] == 4
+
+
+def test_timeout_resets_on_traffic_and_errors():
+    """Indications and errors bring the timeout back to the minimum."""
+    tuner = PollTimeoutTuner(minimum=5, maximum=30, busy=2)
+    tuner.on_result(0, 1.0)
+    tuner.on_result(0, 1.0)
+
+    tuner.on_result(3, 0.1)
+    assert tuner.current == 5
+
+    tuner.on_result(0, 1.0)
+    tuner.on_error()
+    assert tuner.current == 5
+    assert tuner.stats["errors"] == 1
+
+
+def test_timeout_capped_while_busy():
+    """Commands in flight cap the timeout without resetting it."""
+    tuner = PollTimeoutTuner(minimum=5, maximum=30, busy=2)
+    tuner.on_result(0, 1.0)
+
+    assert tuner.next_timeout(busy=True) == 2
+    assert tuner.next_timeout(busy=False) == 10
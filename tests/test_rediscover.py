@@ -0,0 +1,59 @@
+"""Tests for the incremental reconciliation of the plant."""
+
+from .conftest import light
+
+
+def _indication(act_id: int, **fields) -> dict:
+    """Return a light status indication."""
+    return {"cmd_name": "light_switch_ind", "act_id": act_id, **fields}
+
+
+def test_indications_are_not_reported_as_changes(manager, plant):
+    """A device in line with the list is unchanged, whatever it got meanwhile."""
+    manager.get_all_devices()
+    plant.indications.append(_indication(1, status=1, perc=40))
+    manager.status_update(timeout=0)
+    plant.lights[0]["status"] = 1
+
+    changes = manager.rediscover()
+
+    assert not changes
+    # Fields missing from the list are kept.
+    assert manager.get_device_by_act_id(1).device_state["perc"] == 40
+
+
+def test_listed_fields_are_merged(manager, plant):
+    """A changed device keeps its object and gets the listed fields."""
+    device = manager.get_device_by_act_id(2)
+    plant.lights[1]["status"] = 0
+    plant.lights[0]["name"] = "Cucina nuova"
+
+    changes = manager.rediscover()
+
+    assert changes.changed == {device.unique_id}
+    assert manager.get_device_by_act_id(2) is device
+    assert device.state == 0
+    # A renamed device is another device.
+    assert len(changes.added) == len(changes.removed) == 1
+
+
+def test_plant_update_indication(manager, plant):
+    """The plant is rediscovered once, the rest of the batch applies on top."""
+    manager.get_all_devices()
+    reported = []
+    manager.add_plant_listener(reported.append)
+    plant.lights.append(light(3, "Bagno"))
+    plant.indications.extend(
+        [
+            {"cmd_name": "plant_update_ind"},
+            _indication(3, status=1),
+            {"cmd_name": "plant_update_ind"},
+        ]
+    )
+
+    updated = manager.status_update(timeout=0)
+
+    new_device = manager.get_device_by_act_id(3)
+    assert [changes.added for changes in reported] == [{new_device.unique_id}]
+    assert updated == {new_device.unique_id: {"status": (0, 1)}}
+    assert plant.requests.count("light_list_req") == 2
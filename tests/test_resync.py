@@ -0,0 +1,49 @@
+"""Tests for the drift resync."""
+
+import time
+
+
+def test_drifted_device_resynced(manager, plant):
+    """A device whose listed state differs is brought back in line."""
+    kitchen = manager.get_device_by_act_id(1)
+    plant.lights[0]["status"] = 1
+
+    drifted = manager.resync()
+
+    assert drifted == {kitchen.unique_id: {"status": (0, 1)}}
+    assert kitchen.state == 1
+    assert manager.drift_counts["lights"] == 1
+    assert manager.resync_counts["checked"] == 2
+    assert not manager.resync()
+
+
+def test_only_drift_fields_compared(manager, plant):
+    """Fields outside DRIFT_FIELDS, or missing from the list, are not a drift."""
+    manager.get_all_devices()
+    plant.indications.append({"cmd_name": "light_switch_ind", "act_id": 1, "perc": 40})
+    manager.status_update(timeout=0)
+    plant.lights[0]["floor_ind"] = 2
+
+    assert not manager.resync()
+    assert not manager.drift_counts
+
+
+def test_newer_indication_wins(manager, plant, monkeypatch):
+    """A device with an indication received during the read is left alone."""
+    kitchen = manager.get_device_by_act_id(1)
+    plant.lights[0]["status"] = 1
+
+    def request(command, *args, **kwargs):
+        if command["cmd_name"] == "light_list_req":
+            manager.history.record(
+                {"cmd_name": "light_switch_ind", "act_id": 1, "status": 0},
+                time.monotonic(),
+                0,
+            )
+        return plant.request(command, *args, **kwargs)
+
+    monkeypatch.setattr(manager, "_application_request", request)
+
+    assert not manager.resync()
+    assert kitchen.state == 0
+    assert manager.resync_counts["checked"] == 1
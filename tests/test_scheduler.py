@@ -0,0 +1,99 @@
+"""Tests for the priority scheduling of the ETI/Domo requests."""
+
+import threading
+import time
+
+import pytest
+
+from custom_components.came.pycame.deadline import deadline_after
+from custom_components.came.pycame.exceptions import (
+    ETIDomoDeadlineError,
+    ETIDomoRequestDroppedError,
+)
+from custom_components.came.pycame.limiter import AdaptiveLimiter
+from custom_components.came.pycame.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_REFRESH,
+    RequestScheduler,
+    request_priority,
+)
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    """Wait until the condition holds."""
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_request_priority():
+    """List requests are refreshes, everything else is interactive."""
+    assert request_priority("light_list_req") == PRIORITY_REFRESH
+    assert request_priority("light_switch_req") == PRIORITY_INTERACTIVE
+
+
+def test_waiting_requests_served_by_priority():
+    """Queued requests go out by priority, then in arrival order."""
+    scheduler = RequestScheduler(1, reserved=0)
+    order = []
+    threads = []
+
+    def request(name, priority):
+        with scheduler.slot(priority):
+            order.append(name)
+
+    with scheduler.slot(PRIORITY_INTERACTIVE):
+        for name, priority in (
+            ("refresh-1", PRIORITY_REFRESH),
+            ("interactive", PRIORITY_INTERACTIVE),
+            ("refresh-2", PRIORITY_REFRESH),
+        ):
+            thread = threading.Thread(target=request, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            _wait_for(lambda count=len(threads): scheduler.waiting == count)
+
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "refresh-1", "refresh-2"]
+
+
+def test_reserved_slot_kept_for_interactive_requests():
+    """Refreshes can't take the slot reserved to user commands."""
+    scheduler = RequestScheduler(2, reserved=1)
+
+    with scheduler.slot(PRIORITY_REFRESH):
+        with pytest.raises(ETIDomoDeadlineError):
+            with scheduler.slot(PRIORITY_REFRESH, deadline_after(0.05)):
+                pass
+        with scheduler.slot(PRIORITY_INTERACTIVE, deadline_after(0.05)):
+            assert scheduler.active == 2
+
+
+def test_background_request_dropped_when_busy():
+    """A background request which can't be served quickly is dropped."""
+    scheduler = RequestScheduler(1, reserved=0, background_max_wait=0.05)
+
+    with scheduler.slot(PRIORITY_INTERACTIVE):
+        with pytest.raises(ETIDomoRequestDroppedError):
+            with scheduler.slot(PRIORITY_BACKGROUND):
+                pass
+
+    assert scheduler.waiting == 0
+    with scheduler.slot(PRIORITY_BACKGROUND):
+        assert scheduler.active == 1
+
+
+def test_limiter_reduces_the_usable_slots():
+    """After a back-off, fewer requests are let through at once."""
+    limiter = AdaptiveLimiter(3, rate=1000)
+    scheduler = RequestScheduler(3, reserved=0, limiter=limiter)
+    limiter.on_overload()
+    limiter.on_overload()
+
+    with scheduler.slot(PRIORITY_INTERACTIVE):
+        with pytest.raises(ETIDomoDeadlineError):
+            with scheduler.slot(PRIORITY_INTERACTIVE, deadline_after(0.05)):
+                pass
@@ -0,0 +1,57 @@
+"""Tests for the session resumption across restarts."""
+
+
+def _saved(manager, client_id="saved") -> dict:
+    """Return a session saved by a previous run."""
+    return {"host": "127.0.0.1", "serial": manager.serial, "client_id": client_id}
+
+
+def test_export_session(manager):
+    """Only an open session is exported, with the ETI/Domo it belongs to."""
+    manager.get_all_devices()
+
+    assert manager.export_session() == _saved(manager, "session")
+    manager._client_id = None  # pylint: disable=protected-access
+    assert manager.export_session() is None
+
+
+def test_resume_valid_session(manager, plant):
+    """A session still known to the ETI/Domo is reused after one probe."""
+    manager._client_id = None  # pylint: disable=protected-access
+
+    assert manager.resume_session(_saved(manager))
+    assert manager.export_session()["client_id"] == "saved"
+    assert plant.requests == ["feature_list_req"]
+
+
+def test_resume_rejected_session(manager, plant, monkeypatch):
+    """A session rejected by the probe is replaced by a new login."""
+    manager._client_id = None  # pylint: disable=protected-access
+
+    def request(command, *args, **kwargs):
+        # As after a session error: the manager logs in again.
+        manager._client_id = "new"  # pylint: disable=protected-access
+        return plant.request(command, *args, **kwargs)
+
+    monkeypatch.setattr(manager, "_application_request", request)
+
+    assert not manager.resume_session(_saved(manager))
+    assert manager.export_session()["client_id"] == "new"
+
+
+def test_session_of_another_plant_not_resumed(manager, plant):
+    """A session saved for another address or ETI/Domo is not even probed."""
+    manager.get_all_devices()
+    manager._client_id = None  # pylint: disable=protected-access
+    plant.requests.clear()
+
+    assert not manager.resume_session({**_saved(manager), "host": "10.0.0.2"})
+    assert not manager.resume_session({**_saved(manager), "serial": "0002"})
+    assert not plant.requests
+
+
+def test_open_session_kept(manager, plant):
+    """A session already open is not replaced by the saved one."""
+    assert not manager.resume_session(_saved(manager))
+    assert manager.export_session() is not None
+    assert not plant.requests
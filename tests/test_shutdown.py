@@ -0,0 +1,49 @@
+"""Tests for the manager shutdown."""
+
+import threading
+
+
+def test_long_poll_in_flight_is_discarded(manager, plant, monkeypatch):
+    """Indications received after close are not applied."""
+    device = manager.get_device_by_act_id(1)
+    polling = threading.Event()
+    release = threading.Event()
+
+    def request(command, *args, **kwargs):
+        if command["cmd_name"] == "status_update_req":
+            polling.set()
+            release.wait(5)
+        return plant.request(command, *args, **kwargs)
+
+    monkeypatch.setattr(manager, "_application_request", request)
+    plant.indications.append({"cmd_name": "plant_update_ind"})
+    plant.indications.append(
+        {"cmd_name": "light_switch_ind", "act_id": 1, "status": 1}
+    )
+    results = []
+    thread = threading.Thread(target=lambda: results.append(manager.status_update(1)))
+    thread.start()
+    assert polling.wait(5)
+
+    manager.close()
+    release.set()
+    thread.join(5)
+
+    assert results == [{}]
+    assert device.state == 0
+    assert plant.requests.count("light_list_req") == 1
+
+
+def test_no_rediscovery_after_close(manager, plant):
+    """A closed manager sends no request and notifies no listener."""
+    manager.get_all_devices()
+    reported = []
+    manager.add_plant_listener(reported.append)
+    plant.requests.clear()
+
+    manager.close()
+
+    assert not manager.rediscover()
+    assert manager.status_update() == {}
+    assert not plant.requests
+    assert not reported
@@ -0,0 +1,150 @@
+"""Tests for the deduplicated list requests."""
+
+import threading
+import time
+
+from custom_components.came.pycame.deadline import deadline_after
+from custom_components.came.pycame.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_REFRESH,
+    PRIORITY_TIMEOUTS,
+)
+from custom_components.came.pycame.singleflight import (
+    SingleFlight,
+    is_read_request,
+    read_key,
+)
+
+LIGHTS = {"cmd_name": "light_list_req", "topologic_scope": "plant"}
+
+
+def _fetch_concurrently(reads: SingleFlight, callers, send) -> list:
+    """Run the given (priority, deadline) callers a few ms apart."""
+    results = []
+    threads = []
+    for priority, timeout in callers:
+        thread = threading.Thread(
+            target=lambda p=priority, t=timeout: results.append(
+                reads.fetch("lights", send, p, deadline=deadline_after(t))
+            )
+        )
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_read_request_detection():
+    """List requests are reads, identical ones share a key."""
+    assert is_read_request(LIGHTS)
+    assert not is_read_request({"cmd_name": "light_switch_req"})
+    assert read_key(dict(LIGHTS), "light_list_resp") == read_key(
+        LIGHTS, "light_list_resp"
+    )
+
+
+def test_identical_reads_share_one_request():
+    """Later callers join the read in flight, although their deadline is later."""
+    reads = SingleFlight()
+    sent = []
+
+    def send(_deadline):
+        sent.append(1)
+        time.sleep(0.2)
+        return {"array": []}
+
+    timeout = PRIORITY_TIMEOUTS[PRIORITY_REFRESH]
+    results = _fetch_concurrently(reads, [(PRIORITY_REFRESH, timeout)] * 6, send)
+
+    assert len(sent) == 1
+    assert reads.shared == 5
+    assert results == [{"array": []}] * 6
+
+
+def test_lower_priority_read_not_joined():
+    """An interactive caller doesn't wait on a background read."""
+    reads = SingleFlight()
+    sent = []
+
+    def send(_deadline):
+        sent.append(1)
+        time.sleep(0.2)
+        return {}
+
+    _fetch_concurrently(
+        reads, [(PRIORITY_BACKGROUND, 10), (PRIORITY_INTERACTIVE, 10)], send
+    )
+
+    assert len(sent) == 2
+    assert reads.shared == 0
+
+
+def test_read_about_to_expire_not_joined():
+    """A read with almost no time left doesn't take new callers."""
+    reads = SingleFlight()
+    sent = []
+
+    def send(_deadline):
+        sent.append(1)
+        time.sleep(0.2)
+        return {}
+
+    _fetch_concurrently(reads, [(PRIORITY_REFRESH, 0.5), (PRIORITY_REFRESH, 10)], send)
+
+    assert len(sent) == 2
+
+
+def test_recent_response_reused():
+    """A response within max_age is returned without a request."""
+    reads = SingleFlight()
+    sent = []
+
+    def send(_deadline):
+        sent.append(1)
+        return {"array": [1]}
+
+    reads.fetch("lights", send, PRIORITY_REFRESH)
+    assert reads.fetch("lights", send, PRIORITY_REFRESH, max_age=10) == {"array": [1]}
+    reads.fetch("lights", send, PRIORITY_REFRESH)
+
+    assert len(sent) == 2
+
+
+def test_callers_get_their_own_copy():
+    """Changing a response doesn't affect the other callers nor the cache."""
+    reads = SingleFlight()
+
+    def send(_deadline):
+        time.sleep(0.1)
+        return {"array": [{"id": 1, "name": "Notte"}]}
+
+    timeout = PRIORITY_TIMEOUTS[PRIORITY_REFRESH]
+    first, second = _fetch_concurrently(
+        reads, [(PRIORITY_REFRESH, timeout)] * 2, send
+    )
+    first["array"][0]["name"] = "Giorno"
+
+    assert second["array"][0]["name"] == "Notte"
+    cached = reads.fetch("lights", send, PRIORITY_REFRESH, max_age=10)
+    assert cached["array"][0]["name"] == "Notte"
+
+
+def test_old_responses_evicted():
+    """Responses older than max_age are neither reused nor kept."""
+    reads = SingleFlight(max_age=0.05)
+    sent = []
+
+    def send(_deadline):
+        sent.append(1)
+        return {"array": []}
+
+    reads.fetch("lights", send, PRIORITY_REFRESH)
+    time.sleep(0.1)
+    reads.fetch("relays", send, PRIORITY_REFRESH)
+
+    assert "lights" not in reads._last  # pylint: disable=protected-access
+    reads.fetch("lights", send, PRIORITY_REFRESH, max_age=10)
+    assert len(sent) == 3
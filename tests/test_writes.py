@@ -0,0 +1,92 @@
+"""Tests for the coalesced device commands."""
+
+import threading
+import time
+
+import pytest
+
+from custom_components.came.pycame.deadline import deadline_after
+from custom_components.came.pycame.exceptions import ETIDomoDeadlineError
+from custom_components.came.pycame.writes import (
+    WriteCoalescer,
+    merge_commands,
+    write_key,
+)
+
+
+def _switch(act_id: int, status: int) -> dict:
+    """Return a light switch command."""
+    return {"cmd_name": "light_switch_req", "act_id": act_id, "wanted_status": status}
+
+
+def test_write_key():
+    """Only whole-state commands to a device are merged."""
+    assert write_key(_switch(1, 1)) == ("light_switch_req", 1)
+    assert write_key({"cmd_name": "scenario_activation_req", "id": 1}) is None
+
+
+def test_merge_keeps_extended_infos():
+    """A newer command wins, but keeps the extended fields already queued."""
+    queued = {"cmd_name": "thermo_zone_config_req", "act_id": 1, "extended_infos": 1}
+    newer = {"cmd_name": "thermo_zone_config_req", "act_id": 1, "set_point": 200}
+
+    assert merge_commands(queued, newer)["extended_infos"] == 1
+
+
+def test_queued_commands_merged():
+    """Commands queued behind one in flight go out as a single command."""
+    coalescer = WriteCoalescer()
+    release = threading.Event()
+    sent = []
+    results = {}
+
+    def send(command, _deadline):
+        sent.append(command["wanted_status"])
+        if len(sent) == 1:
+            release.wait(2)
+        return {"sent": command["wanted_status"]}
+
+    def submit(status):
+        results[status] = coalescer.submit(_switch(1, status), send)
+
+    first = threading.Thread(target=submit, args=(1,))
+    first.start()
+    while not sent:
+        time.sleep(0.005)
+
+    queued = [threading.Thread(target=submit, args=(status,)) for status in (0, 1, 0)]
+    for thread in queued:
+        thread.start()
+    while coalescer.merged < 2:
+        time.sleep(0.005)
+    release.set()
+    for thread in [first] + queued:
+        thread.join()
+
+    assert sent == [1, 0]
+    assert coalescer.merged == 2
+    assert results == {1: {"sent": 0}, 0: {"sent": 0}}
+
+
+def test_expired_queued_command_dropped():
+    """A queued command is not sent once its deadline has passed."""
+    coalescer = WriteCoalescer()
+    release = threading.Event()
+    sent = []
+
+    def send(command, _deadline):
+        sent.append(command["wanted_status"])
+        release.wait(2)
+        return {}
+
+    first = threading.Thread(target=coalescer.submit, args=(_switch(1, 1), send))
+    first.start()
+    while not sent:
+        time.sleep(0.005)
+
+    with pytest.raises(ETIDomoDeadlineError):
+        coalescer.submit(_switch(1, 0), send, deadline_after(0.05))
+    release.set()
+    first.join()
+
+    assert sent == [1]